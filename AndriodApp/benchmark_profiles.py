@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Detection Profile Benchmark
+Measures memory footprint, startup time, latency and accuracy delta of the
+"lite" profile against the "full" profile on the bundled test sentences,
+what normalizing once with PreparedText saves over per-stage copies and
+what bound pruning saves in exact reference similarity
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from difflib import SequenceMatcher
+from typing import Dict, Any
+
+# Runs in a fresh interpreter so imports and startup are measured cleanly
+_PROBE = r"""
+import json, resource, sys, time
+start = time.perf_counter()
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+detector = ContentDetector(profile=sys.argv[1])
+startup = time.perf_counter() - start
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+rss_after_startup = rss_kb()
+rounds = int(sys.argv[2])
+results = []
+start = time.perf_counter()
+for _ in range(rounds):
+    results = [detector.detect_content(text) for text in TEST_SENTENCES]
+latency = (time.perf_counter() - start) * 1000 / (rounds * len(TEST_SENTENCES))
+
+print(json.dumps({
+    "profile": sys.argv[1],
+    "spacy_loaded": detector.nlp is not None,
+    "spacy_imported": "spacy" in sys.modules,
+    "startup_s": startup,
+    "rss_mb": rss_after_startup / 1024,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "latency_ms": latency,
+    "verdicts": [[r["is_detected"], r["category"], r["confidence"]] for r in results]
+}))
+"""
+
+
+def measure_profile(profile: str, rounds: int) -> Dict[str, Any]:
+    """Start a fresh interpreter, build the detector and score the test sentences"""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, profile, str(rounds)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def accuracy_delta(full: Dict[str, Any], lite: Dict[str, Any]) -> Dict[str, float]:
+    """Verdict agreement and confidence drift of lite against full"""
+    pairs = list(zip(full["verdicts"], lite["verdicts"]))
+    same = sum(a[0] == b[0] and a[1] == b[1] for a, b in pairs)
+    drift = max((abs(a[2] - b[2]) for a, b in pairs), default=0.0)
+    return {"agreement": same / max(len(pairs), 1), "max_confidence_drift": drift}
+
+
+def legacy_stage_scores(detector, text: str) -> None:
+    """The stages as they ran before PreparedText, kept as the baseline
+
+    Each stage lowercased its own copy of the input, the context stage split
+    words it never used and similarity lowercased text and reference again
+    for every comparison.
+    """
+    text = re.sub(r'\s+', ' ', text.lower().strip())
+    text_lower = text.lower()
+    for patterns in detector.patterns.values():
+        for pattern in patterns:
+            re.search(pattern, text_lower, re.IGNORECASE)
+    text_lower = text.lower()
+    text_lower.split()
+    for words in detector.malicious_context_words.values():
+        for word in words:
+            word in text_lower
+    text_lower = text.lower()
+    for indicator in detector.intent_indicators:
+        indicator in text_lower
+    text_lower = text.lower()
+    for sentences in detector.reference_sentences.values():
+        for sentence in sentences:
+            SequenceMatcher(None, text_lower.lower(), sentence.lower().lower()).ratio()
+
+
+def prepared_stage_scores(detector, text: str) -> None:
+    """The stages sharing one PreparedText"""
+    prepared = detector.prepare_text(text)
+    detector.check_pattern_matching(prepared)
+    detector.check_context_words(prepared)
+    detector.check_intent_indicators(prepared)
+    detector.check_reference_similarity(prepared)
+
+
+def measure_stages(run, detector, sentences, rounds: int) -> Dict[str, float]:
+    """Latency and peak transient allocation per message for a stage runner"""
+    run(detector, sentences[0])
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in sentences:
+            run(detector, text)
+    latency_us = (time.perf_counter() - start) * 1e6 / (rounds * len(sentences))
+
+    peaks = []
+    tracemalloc.start()
+    for text in sentences:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        run(detector, text)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return {"latency_us": latency_us, "peak_bytes": sum(peaks) / len(peaks)}
+
+
+def count_calls(run, detector, sentences, name: str) -> float:
+    """Mean calls per message of the builtin method ``name``, counted with a profile hook"""
+    run(detector, sentences[0])
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event == "c_call" and getattr(arg, "__name__", "") == name:
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        for text in sentences:
+            run(detector, text)
+    finally:
+        sys.setprofile(None)
+    return calls / len(sentences)
+
+
+def benchmark_prepared_text(rounds: int) -> None:
+    """Compare per-stage normalization with one shared PreparedText"""
+    from deepfake_detector import ContentDetector, TEST_SENTENCES
+
+    detector = ContentDetector(profile="lite")
+    legacy_copies = count_calls(legacy_stage_scores, detector, TEST_SENTENCES, "lower")
+    prepared_copies = count_calls(prepared_stage_scores, detector, TEST_SENTENCES, "lower")
+    legacy_splits = count_calls(legacy_stage_scores, detector, TEST_SENTENCES, "split")
+    prepared_splits = count_calls(prepared_stage_scores, detector, TEST_SENTENCES, "split")
+
+    legacy = measure_stages(legacy_stage_scores, detector, TEST_SENTENCES, rounds)
+    prepared = measure_stages(prepared_stage_scores, detector, TEST_SENTENCES, rounds)
+
+    print("\n✂️  NORMALIZE-ONCE (PreparedText) VS PER-STAGE COPIES")
+    print("=" * 60)
+    print(f"{'':26}{'per-stage':>12}{'prepared':>12}")
+    print(f"{'lower() calls / message':26}{legacy_copies:12.1f}{prepared_copies:12.1f}")
+    print(f"{'split() calls / message':26}{legacy_splits:12.1f}{prepared_splits:12.1f}")
+    print(f"{'peak alloc / message (B)':26}{legacy['peak_bytes']:12.0f}{prepared['peak_bytes']:12.0f}")
+    print(f"{'stage latency (us)':26}{legacy['latency_us']:12.1f}{prepared['latency_us']:12.1f}")
+
+
+def unpruned_similarity(detector, text: str) -> Dict[str, float]:
+    """Reference similarity comparing every sentence in full, the baseline"""
+    text_lower = detector.prepare_text(text).text
+    return {category: max((SequenceMatcher(None, text_lower, sentence).ratio()
+                           for sentence in sentences), default=0.0)
+            for category, sentences in detector._lowered_references().items()}
+
+
+def benchmark_similarity(rounds: int) -> None:
+    """Compare full comparisons with cached, bound-pruned matchers"""
+    from deepfake_detector import ContentDetector, TEST_SENTENCES
+
+    detector = ContentDetector(profile="lite")
+    for text in TEST_SENTENCES:
+        expected = unpruned_similarity(detector, text)
+        actual = detector.check_reference_similarity(text)
+        if actual != expected:
+            raise AssertionError(f"pruned similarity differs for {text!r}: {actual} != {expected}")
+
+    timings = {}
+    for name, run in (("full", unpruned_similarity), ("pruned", ContentDetector.check_reference_similarity)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for text in TEST_SENTENCES:
+                run(detector, text)
+        timings[name] = (time.perf_counter() - start) * 1e6 / (rounds * len(TEST_SENTENCES))
+
+    print("\n🔍 EXACT REFERENCE SIMILARITY")
+    print("=" * 60)
+    print(f"{'full comparisons (us/msg)':30}{timings['full']:10.1f}")
+    print(f"{'cached + pruned (us/msg)':30}{timings['pruned']:10.1f}")
+    print(f"Scores bit-identical on all {len(TEST_SENTENCES)} sentences, "
+          f"{timings['full'] / timings['pruned']:.1f}x faster")
+
+
+def main():
+    """Benchmark both profiles and print a comparison table"""
+    parser = argparse.ArgumentParser(description="Compare full and lite detection profiles")
+    parser.add_argument("--rounds", type=int, default=20, help="passes over the test sentences")
+    args = parser.parse_args()
+
+    full = measure_profile("full", args.rounds)
+    lite = measure_profile("lite", args.rounds)
+    delta = accuracy_delta(full, lite)
+
+    print("📏 DETECTION PROFILE BENCHMARK")
+    print("=" * 60)
+    print(f"{'':18}{'full':>12}{'lite':>12}")
+    print(f"{'spaCy model loaded':18}{str(full['spacy_loaded']):>12}{str(lite['spacy_loaded']):>12}")
+    print(f"{'startup (s)':18}{full['startup_s']:12.3f}{lite['startup_s']:12.3f}")
+    print(f"{'RSS (MB)':18}{full['rss_mb']:12.1f}{lite['rss_mb']:12.1f}")
+    print(f"{'peak RSS (MB)':18}{full['peak_rss_mb']:12.1f}{lite['peak_rss_mb']:12.1f}")
+    print(f"{'latency (ms/msg)':18}{full['latency_ms']:12.3f}{lite['latency_ms']:12.3f}")
+    print(f"\n🎯 Verdict agreement: {delta['agreement']:.0%}, "
+          f"max confidence drift: {delta['max_confidence_drift']:.4f}")
+    if not full["spacy_loaded"]:
+        print("⚠️  en_core_web_sm is not installed, so the full profile ran without its model")
+
+    benchmark_prepared_text(args.rounds)
+    benchmark_similarity(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
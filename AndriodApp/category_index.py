@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Category Trigger Index
+Inverted index from character trigrams to the patterns and keywords that
+can fire on them, so a message only evaluates the rules (and categories)
+it could score on instead of every rule of every category
+"""
+
+import argparse
+import time
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from rule_scores import PATTERN_HIT, CONTEXT_HIT, INTENT_HIT, accumulate
+
+# Repeat opcodes; their value is (min, max, repeated subpattern)
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT,
+            getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT)}
+
+def required_literal(pattern: str) -> str:
+    """Longest lowercase ASCII substring every match of ``pattern`` contains
+
+    Reads the parsed top level of the pattern: literal characters (however
+    they are escaped) extend a run, a character repeated at least once ends
+    it, and groups, classes and everything else just end it. A top-level
+    ``|`` means nothing is required. Returns "" when no literal could be
+    proven, which makes the pattern run on every message.
+    """
+    runs: List[str] = []
+    current: List[str] = []
+
+    def finish() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    def literal_char(item) -> str:
+        op, value = item
+        if op == sre_parse.LITERAL and value < 128:
+            return chr(value).lower()
+        return ""
+
+    for op, value in sre_parse.parse(pattern):
+        if op == sre_parse.BRANCH:
+            return ""
+        char = literal_char((op, value))
+        if char:
+            current.append(char)
+            continue
+        if op in _REPEATS:
+            minimum, _, body = value
+            if minimum >= 1 and len(body) == 1 and literal_char(body[0]):
+                current.append(literal_char(body[0]))
+        finish()
+    finish()
+    return max(runs, key=len, default="")
+
+
+def rules_source(detector, *tables) -> Tuple:
+    """What a cache built from ``tables`` depends on, for ``same_source``"""
+    return tables + (getattr(detector, "rules_version", 0),)
+
+
+def same_source(cached: Tuple, current: Tuple) -> bool:
+    """Whether a cache built from ``cached`` still holds for ``current``
+
+    Tables are compared by identity, so the check costs the same for any
+    number of rules: replacing a table (as ``apply_ruleset`` does) or
+    calling the detector's ``rules_changed()`` after an in-place edit
+    invalidates the cache.
+    """
+    return (len(cached) == len(current) and cached[-1] == current[-1]
+            and all(old is new for old, new in zip(cached[:-1], current[:-1])))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Every three-character substring of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Entries keyed by one trigram of a literal every match must contain
+
+    Each entry is stored under the rarest trigram of its literal, so a
+    message looks up only its own trigrams and gets each candidate once.
+    Entries whose literal is shorter than three characters are candidates
+    for every message.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        entries = list(entries)
+        counts = Counter(gram for literal, _ in entries for gram in trigrams(literal))
+        self.triggers: Dict[str, List[Any]] = {}
+        self.always: List[Any] = []
+        self.size = len(entries)
+        for literal, payload in entries:
+            grams = sorted(trigrams(literal))
+            if grams:
+                key = min(grams, key=counts.__getitem__)
+                self.triggers.setdefault(key, []).append(payload)
+            else:
+                self.always.append(payload)
+
+    def candidates(self, grams: Set[str]) -> List[Any]:
+        """Payloads whose trigger trigram is among ``grams``"""
+        found = list(self.always)
+        triggers = self.triggers
+        for gram in grams:
+            payloads = triggers.get(gram)
+            if payloads:
+                found.extend(payloads)
+        return found
+
+
+class CategoryIndex:
+    """Pattern, context and intent scores of a ContentDetector from an inverted index
+
+    Scores equal the detector's ``check_pattern_matching``,
+    ``check_context_words`` and ``check_intent_indicators`` (every category
+    key is present, untouched ones at 0.0), but only the regexes and
+    keywords sharing a trigram with the message are tested. Regex literals
+    are only trusted on ASCII messages, where IGNORECASE cannot match a
+    different character; other messages run every pattern.
+    """
+
+    def __init__(self, detector):
+        self.source = self.signature(detector)
+        # Compiled patterns: past the re module's cache size, re.search on
+        # pattern strings would recompile them on every message
+        self.all_patterns = [(category, regex)
+                             for category, patterns in detector.compiled_patterns().items()
+                             for regex in patterns]
+        self.pattern_index = TrigramIndex(
+            (required_literal(regex.pattern), (category, regex)) for category, regex in self.all_patterns
+        )
+        # Keywords are tested with "in", so the keyword itself is the literal
+        self.context_index = TrigramIndex(
+            (word, (category, word))
+            for category, words in detector.malicious_context_words.items() for word in words
+        )
+        self.intent_index = TrigramIndex((indicator, indicator) for indicator in detector.intent_indicators)
+        self._pattern_zero = {category: 0.0 for category in detector.patterns}
+        self._context_zero = {category: 0.0 for category in detector.malicious_context_words}
+
+    @staticmethod
+    def signature(detector) -> Tuple:
+        """The rule tables the index is built from, see ``same_source``"""
+        return rules_source(detector, detector.patterns, detector.malicious_context_words,
+                            detector.intent_indicators)
+
+    def pattern_scores(self, text: str, grams: Set[str] = None) -> Tuple[Dict[str, float], Set[str]]:
+        """Pattern scores of prepared text and the categories that matched"""
+        if text.isascii():
+            candidates = self.pattern_index.candidates(trigrams(text) if grams is None else grams)
+        else:
+            candidates = self.all_patterns
+        hits: Counter = Counter()
+        for category, regex in candidates:
+            if regex.search(text):
+                hits[category] += 1
+        scores = self._pattern_zero.copy()
+        for category, count in hits.items():
+            scores[category] = accumulate(count, PATTERN_HIT)
+        return scores, set(hits)
+
+    def context_scores(self, text: str, grams: Set[str] = None) -> Tuple[Dict[str, float], Set[str]]:
+        """Context-word scores of prepared text and the categories that matched"""
+        hits: Counter = Counter()
+        for category, word in self.context_index.candidates(trigrams(text) if grams is None else grams):
+            if word in text:
+                hits[category] += 1
+        scores = self._context_zero.copy()
+        for category, count in hits.items():
+            scores[category] = accumulate(count, CONTEXT_HIT)
+        return scores, set(hits)
+
+    def intent_score(self, text: str, grams: Set[str] = None) -> float:
+        """Intent score of prepared text"""
+        candidates = self.intent_index.candidates(trigrams(text) if grams is None else grams)
+        return accumulate(sum(indicator in text for indicator in candidates), INTENT_HIT)
+
+    def score_rules(self, text: str) -> Tuple[Dict[str, float], Dict[str, float], float, Set[str]]:
+        """Pattern, context and intent scores plus every category that was hit"""
+        grams = trigrams(text)
+        pattern_scores, pattern_hits = self.pattern_scores(text, grams)
+        context_scores, context_hits = self.context_scores(text, grams)
+        return pattern_scores, context_scores, self.intent_score(text, grams), pattern_hits | context_hits
+
+    def get_stats(self) -> Dict[str, Any]:
+        """How many rules sit behind a trigger and how many run on every message"""
+        return {
+            name: {"entries": index.size, "always": len(index.always), "triggers": len(index.triggers)}
+            for name, index in (("pattern", self.pattern_index), ("context", self.context_index),
+                                ("intent", self.intent_index))
+        }
+
+
+def untriggered_bound(detector) -> float:
+    """Highest final score a category without pattern or context hits can reach"""
+    weights = detector.stage_weights
+    score = 0.0 * weights["pattern"] + 0.0 * weights["context"] + 1.0 * weights["similarity"]
+    if getattr(detector, "classifier", None) is not None:
+        score += 1.0 * weights.get("classifier", 0.0)
+    return min(score + 1.0 * weights["intent"], 1.0)
+
+
+def synthetic_categories(detector, copies: int) -> None:
+    """Grow a detector to ``copies`` times its categories, for benchmarks
+
+    Each copy renames the category and swaps a made-up word into its rules,
+    so the copies trigger on different messages than the originals.
+    """
+    patterns = dict(detector.patterns)
+    context = dict(detector.malicious_context_words)
+    references = dict(detector.reference_sentences)
+    for copy in range(1, copies):
+        marker = f"zq{copy:02d}x"
+        for category, rules in detector.patterns.items():
+            patterns[f"{category}_{copy}"] = [f"{marker}\\s+{rule}" for rule in rules]
+        for category, words in detector.malicious_context_words.items():
+            context[f"{category}_{copy}"] = [f"{marker} {word}" for word in words]
+        for category, sentences in detector.reference_sentences.items():
+            references[f"{category}_{copy}"] = [f"{marker} {sentence}" for sentence in sentences]
+    detector.patterns = patterns
+    detector.malicious_context_words = context
+    detector.reference_sentences = references
+
+
+def main():
+    """Compare indexed and full rule evaluation as the category count grows"""
+    parser = argparse.ArgumentParser(description="Benchmark the category trigger index")
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 4, 10],
+                        help="multiples of the built-in categories to test")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    from deepfake_detector import ContentDetector, TEST_SENTENCES
+
+    print("🗂️  CATEGORY TRIGGER INDEX")
+    print("=" * 60)
+    for copies in args.copies:
+        plain = ContentDetector(profile="lite")
+        synthetic_categories(plain, copies)
+        indexed = ContentDetector(profile="lite")
+        synthetic_categories(indexed, copies)
+        indexed.use_category_index()
+
+        timings = {}
+        for name, detector in (("full", plain), ("indexed", indexed)):
+            detector.detect_content(TEST_SENTENCES[0])
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                for text in TEST_SENTENCES:
+                    detector.detect_content(text)
+            timings[name] = (time.perf_counter() - start) * 1000 / (args.rounds * len(TEST_SENTENCES))
+
+        same = all(
+            (a["is_detected"], a["category"], a["confidence"]) == (b["is_detected"], b["category"], b["confidence"])
+            for a, b in ((plain.detect_content(t), indexed.detect_content(t)) for t in TEST_SENTENCES)
+        )
+        print(f"{len(plain.patterns):4d} categories: full {timings['full']:.3f} ms, "
+              f"indexed {timings['indexed']:.3f} ms ({timings['full'] / timings['indexed']:.1f}x), "
+              f"same verdicts: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Hashed-Feature Classifier Stage
+Optional linear classifier over hashed word and character n-grams, trained
+from the detector's reference sentences plus any labeled data. No
+vocabulary is stored: every category score comes from one sparse dot
+product against the saved weights.
+"""
+
+import argparse
+import hashlib
+from typing import Dict, List, Union
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import normalize
+
+from prepared_text import PreparedText
+
+CLASSIFIER_FORMAT = 1
+
+# Feature space per analyzer; weights are stored sparse, so only hashed
+# features seen in training take space on disk
+WORD_FEATURES = 2 ** 18
+CHAR_FEATURES = 2 ** 18
+
+# Harmless requests used as the "safe" class when no labeled data is given
+SAFE_SENTENCES = [
+    "Create a beautiful landscape painting",
+    "Help me learn programming",
+    "What's the weather like today?",
+    "How do I cook pasta?",
+    "Recommend a good book to read this weekend",
+    "Translate this paragraph into Spanish",
+    "Write a birthday message for my mom",
+    "Explain how photosynthesis works",
+    "How can I improve my running time?",
+    "Summarize the news about the football match",
+    "What is the capital of Australia?",
+    "Help me plan a trip to the mountains"
+]
+
+
+# Stateless: the same hashing on every machine, nothing to fit or store
+_WORD_VECTORIZER = HashingVectorizer(analyzer="word", ngram_range=(1, 2), n_features=WORD_FEATURES,
+                                     alternate_sign=False, norm=None, lowercase=False)
+_CHAR_VECTORIZER = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), n_features=CHAR_FEATURES,
+                                     alternate_sign=False, norm=None, lowercase=False)
+
+
+def hashed_features(texts: List[str]) -> sparse.csr_matrix:
+    """L2-normalized hashed word and char n-grams of prepared texts"""
+    stacked = sparse.hstack([_WORD_VECTORIZER.transform(texts), _CHAR_VECTORIZER.transform(texts)],
+                            format="csr")
+    return normalize(stacked)
+
+
+class HashedTextClassifier:
+    """Linear one-vs-rest scores per category over hashed n-gram features
+
+    ``score_batch`` vectorizes all texts and multiplies them with the
+    weight matrix once; ``score`` is the single-text case. Scores are
+    sigmoid probabilities in [0, 1], one per category (the "safe" class is
+    used in training but not reported).
+    """
+
+    def __init__(self, classes: List[str], weights: sparse.csr_matrix, intercepts: np.ndarray):
+        self.classes = list(classes)
+        self.weights = weights.tocsr()
+        self.intercepts = np.asarray(intercepts, dtype=np.float64)
+        self.categories = [(index, name) for index, name in enumerate(self.classes) if name != "safe"]
+        digest = hashlib.sha256(" ".join(self.classes).encode("utf-8"))
+        for array in (self.weights.data, self.weights.indices, self.weights.indptr, self.intercepts):
+            digest.update(array.tobytes())
+        self.version = digest.hexdigest()[:16]
+
+    def score_batch(self, texts: List[Union[str, PreparedText]]) -> List[Dict[str, float]]:
+        """Category scores for many texts with one sparse matrix product"""
+        prepared = [PreparedText.of(text).text for text in texts]
+        logits = (hashed_features(prepared) @ self.weights.T).toarray() + self.intercepts
+        probabilities = 1.0 / (1.0 + np.exp(-logits))
+        return [{name: float(row[index]) for index, name in self.categories} for row in probabilities]
+
+    def score(self, text: Union[str, PreparedText]) -> Dict[str, float]:
+        """Category scores for one text"""
+        return self.score_batch([text])[0]
+
+    def save(self, path: str) -> None:
+        """Write the weights as a compressed .npz (no vocabulary to store)"""
+        np.savez_compressed(
+            path, format=np.array(CLASSIFIER_FORMAT), classes=np.array(self.classes),
+            data=self.weights.data, indices=self.weights.indices, indptr=self.weights.indptr,
+            shape=np.array(self.weights.shape), intercepts=self.intercepts
+        )
+
+
+def load_classifier(path: str) -> HashedTextClassifier:
+    """Load a classifier written by HashedTextClassifier.save"""
+    with np.load(path) as data:
+        if int(data["format"]) != CLASSIFIER_FORMAT:
+            raise ValueError(f"Unsupported classifier format: {int(data['format'])}")
+        weights = sparse.csr_matrix((data["data"], data["indices"], data["indptr"]),
+                                    shape=tuple(data["shape"]))
+        return HashedTextClassifier([str(name) for name in data["classes"]], weights, data["intercepts"])
+
+
+def train_classifier(detector, texts: List[str] = None, labels: List[str] = None,
+                     epochs: int = 50, seed: int = 0) -> HashedTextClassifier:
+    """Train on the detector's reference sentences plus optional labeled rows
+
+    Labels are category names of ``detector.patterns`` or "safe"; rows with
+    other labels are ignored. Without labeled safe rows ``SAFE_SENTENCES``
+    stand in for the safe class.
+    """
+    categories = list(detector.patterns.keys())
+    train_texts, train_labels = [], []
+    for category, sentences in detector.reference_sentences.items():
+        if category in categories:
+            train_texts.extend(sentences)
+            train_labels.extend([category] * len(sentences))
+    for text, label in zip(texts or [], labels or []):
+        if label == "safe" or label in categories:
+            train_texts.append(text)
+            train_labels.append(label)
+    if "safe" not in train_labels:
+        train_texts.extend(SAFE_SENTENCES)
+        train_labels.extend(["safe"] * len(SAFE_SENTENCES))
+
+    features = hashed_features([PreparedText.of(text).text for text in train_texts])
+
+    model = SGDClassifier(loss="log_loss", alpha=1e-4, max_iter=epochs, tol=None,
+                          class_weight="balanced", random_state=seed)
+    model.fit(features, train_labels)
+    # Binary models have one row; expand it so every class has its own
+    coef = model.coef_ if len(model.classes_) > 2 else np.vstack([-model.coef_, model.coef_])
+    intercepts = (model.intercept_ if len(model.classes_) > 2
+                  else np.concatenate([-model.intercept_, model.intercept_]))
+    return HashedTextClassifier(list(model.classes_), sparse.csr_matrix(coef), intercepts)
+
+
+def main():
+    """Train the classifier stage and save it"""
+    parser = argparse.ArgumentParser(description="Train the hashed-feature classifier stage")
+    parser.add_argument("--corpus", help="labeled .jsonl/.csv rows (see tune_weights.py)")
+    parser.add_argument("--output", default="classifier.npz")
+    parser.add_argument("--epochs", type=int, default=50)
+    args = parser.parse_args()
+
+    from deepfake_detector import ContentDetector, TEST_SENTENCES
+    detector = ContentDetector(profile="lite")
+    texts = labels = None
+    if args.corpus:
+        from tune_weights import load_labeled_corpus
+        texts, labels = load_labeled_corpus(args.corpus)
+
+    classifier = train_classifier(detector, texts, labels, epochs=args.epochs)
+    classifier.save(args.output)
+    print(f"🧮 Trained on {len(classifier.classes)} classes, "
+          f"{classifier.weights.nnz} non-zero weights → {args.output}")
+    for text, scores in zip(TEST_SENTENCES, classifier.score_batch(TEST_SENTENCES)):
+        category = max(scores, key=scores.get)
+        print(f"  {scores[category]:.2f} {category:28} {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Columnar Scan Results
+Writes corpus and batch scan results as fixed-width numpy columns flushed
+in chunks, which downstream analysis memory-maps instead of parsing JSON
+"""
+
+import json
+import os
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+COLUMNAR_FORMAT = 1
+
+# Column name -> (dtype, values per row; 0 means one per category)
+COLUMNS = {
+    "offset": ("<i8", 1),        # byte offset or row number of the source message
+    "is_detected": ("|b1", 1),
+    "category": ("<i2", 1),      # index into the category list, -1 for safe
+    "confidence": ("<f8", 1),
+    "scores": ("<f4", 0)         # combined score of every category
+}
+
+
+def result_columns(results: List[Tuple[int, Dict[str, Any]]], categories: List[str]) -> Dict[str, np.ndarray]:
+    """Columns for ``(offset, detect_content result)`` pairs"""
+    index = {category: i for i, category in enumerate(categories)}
+    rows = len(results)
+    columns = {
+        "offset": np.fromiter((offset for offset, _ in results), dtype=np.int64, count=rows),
+        "is_detected": np.fromiter((r["is_detected"] for _, r in results), dtype=np.bool_, count=rows),
+        "category": np.fromiter((index.get(r["category"], -1) for _, r in results), dtype=np.int16, count=rows),
+        "confidence": np.fromiter((r["confidence"] for _, r in results), dtype=np.float64, count=rows),
+        "scores": np.zeros((rows, len(categories)), dtype=np.float32)
+    }
+    for row, (_, result) in enumerate(results):
+        combined = result.get("details", {}).get("combined_scores", {})
+        columns["scores"][row] = [combined.get(category, 0.0) for category in categories]
+    return columns
+
+
+class ColumnarWriter:
+    def __init__(self, directory: str, categories: List[str], chunk_rows: int = 65536,
+                 keep_rows: int = None):
+        """Write columns under ``directory``, one raw little-endian file each
+
+        Rows are buffered and appended every ``chunk_rows``; ``meta.json``
+        is rewritten after each flush, so a scan that is still running (or
+        was interrupted) can already be loaded up to its last chunk. With
+        ``keep_rows`` an existing output is continued instead: its first
+        ``keep_rows`` rows are kept, anything after them is cut off and new
+        rows are appended, which is how a scan resumes from a checkpoint.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.categories = list(categories)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._pending: List[Tuple[int, Dict[str, Any]]] = []
+        mode = "wb"
+        if keep_rows is not None:
+            meta = _read_meta(directory)
+            if meta["categories"] != self.categories:
+                raise ValueError("Existing columnar output has different categories")
+            if meta["rows"] < keep_rows:
+                raise ValueError(f"Existing columnar output has {meta['rows']} rows, "
+                                 f"cannot resume at row {keep_rows}")
+            for name, (dtype, width) in COLUMNS.items():
+                row_bytes = np.dtype(dtype).itemsize * (width or len(self.categories))
+                with open(os.path.join(directory, f"{name}.bin"), "r+b") as f:
+                    f.truncate(keep_rows * row_bytes)
+            self.rows = keep_rows
+            mode = "ab"
+        self._files = {name: open(os.path.join(directory, f"{name}.bin"), mode) for name in COLUMNS}
+        if keep_rows is not None:
+            self._write_meta()
+
+    def append(self, offset: int, result: Dict[str, Any]) -> None:
+        """Buffer one ``detect_content`` result"""
+        self._pending.append((offset, result))
+        if len(self._pending) >= self.chunk_rows:
+            self.flush()
+
+    def append_columns(self, columns: Dict[str, np.ndarray]) -> None:
+        """Append a chunk that is already in columnar form"""
+        self.flush()
+        self._write(columns)
+
+    def _write(self, columns: Dict[str, np.ndarray]) -> None:
+        rows = len(columns["offset"])
+        if not rows:
+            return
+        for name, (dtype, _) in COLUMNS.items():
+            self._files[name].write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+            self._files[name].flush()
+        self.rows += rows
+        self._write_meta()
+
+    def flush(self) -> None:
+        """Write buffered rows as one chunk"""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._write(result_columns(pending, self.categories))
+
+    def _write_meta(self) -> None:
+        meta = {
+            "format": COLUMNAR_FORMAT,
+            "rows": self.rows,
+            "categories": self.categories,
+            "columns": {name: {"dtype": dtype, "width": width or len(self.categories)}
+                        for name, (dtype, width) in COLUMNS.items()}
+        }
+        path = os.path.join(self.directory, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def close(self) -> None:
+        """Flush and close the column files"""
+        self.flush()
+        self._write_meta()
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _read_meta(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"Unsupported columnar format: {meta.get('format')}")
+    return meta
+
+
+def load_columns(directory: str) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """Memory-map the columns written by ColumnarWriter; returns (columns, categories)"""
+    meta = _read_meta(directory)
+    rows = meta["rows"]
+    columns = {}
+    for name, spec in meta["columns"].items():
+        shape = (rows, spec["width"]) if name == "scores" else (rows,)
+        if rows == 0:
+            columns[name] = np.zeros(shape, dtype=spec["dtype"])
+        else:
+            columns[name] = np.memmap(os.path.join(directory, f"{name}.bin"), dtype=spec["dtype"],
+                                      mode="r", shape=shape)
+    return columns, meta["categories"]
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Compiled Ruleset Artifact
+Build step that turns the canonical detector rules into a compact,
+versioned table/automaton file that the Android and Chrome clients (and
+the Python loader below) can load without building matchers at runtime
+"""
+
+import argparse
+import json
+import re
+from collections import deque
+from difflib import SequenceMatcher
+from typing import Dict, List, Any
+
+from rule_scores import PATTERN_HIT, CONTEXT_HIT, INTENT_HIT, accumulate
+from ruleset import export_ruleset
+
+ARTIFACT_FORMAT = "neurogate-compiled-ruleset"
+ARTIFACT_VERSION = 1
+
+# Keyword kinds stored in the automaton outputs
+KIND_CONTEXT = 0
+KIND_INTENT = 1
+
+
+def build_automaton(keywords: List[str]) -> Dict[str, List]:
+    """Aho-Corasick automaton over literal keywords
+
+    ``goto[state]`` maps a character to the next state, ``fail[state]`` is
+    the fallback state and ``output[state]`` lists the keyword ids that end
+    at that state, including those inherited through fail links. One pass
+    over the text finds every keyword occurring as a substring, which is
+    what ``keyword in text`` tests in the detectors.
+    """
+    goto = [{}]
+    output = [[]]
+    for keyword_id, keyword in enumerate(keywords):
+        state = 0
+        for char in keyword:
+            if char not in goto[state]:
+                goto.append({})
+                output.append([])
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        output[state].append(keyword_id)
+
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, next_state in goto[state].items():
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(char, 0)
+            output[next_state] = output[next_state] + output[fail[next_state]]
+    return {"goto": goto, "fail": fail, "output": output}
+
+
+def compile_ruleset(detector) -> Dict[str, Any]:
+    """Compile a detector's rules into the client artifact"""
+    rules = export_ruleset(detector)
+
+    # Same keyword may appear in several lists; keep one automaton entry each
+    keywords: List[str] = []
+    keyword_ids: Dict[str, int] = {}
+    targets: List[List[List[int]]] = []
+
+    def keyword_id(word: str) -> int:
+        if word not in keyword_ids:
+            keyword_ids[word] = len(keywords)
+            keywords.append(word)
+            targets.append([])
+        return keyword_ids[word]
+
+    context_categories = list(rules["malicious_context_words"].keys())
+    for index, category in enumerate(context_categories):
+        for word in rules["malicious_context_words"][category]:
+            targets[keyword_id(word)].append([KIND_CONTEXT, index])
+    for index, indicator in enumerate(rules["intent_indicators"]):
+        targets[keyword_id(indicator)].append([KIND_INTENT, index])
+
+    categories = list(rules["patterns"].keys())
+    return {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_VERSION,
+        "ruleset_version": rules["version"],
+        "categories": categories,
+        "context_categories": context_categories,
+        "similarity_categories": list(rules["reference_sentences"].keys()),
+        "weights": rules["stage_weights"],
+        "threshold": rules["detection_threshold"],
+        "hit_scores": {"pattern": PATTERN_HIT, "context": CONTEXT_HIT, "intent": INTENT_HIT},
+        # Regex sources use the syntax shared by Python, Kotlin and JavaScript
+        "patterns": [[categories.index(category), pattern]
+                     for category in categories for pattern in rules["patterns"][category]],
+        "keywords": keywords,
+        "keyword_targets": targets,
+        "automaton": build_automaton(keywords),
+        "references": [[index, sentence.lower()]
+                       for index, category in enumerate(rules["reference_sentences"])
+                       for sentence in rules["reference_sentences"][category]]
+    }
+
+
+def save_compiled(artifact: Dict[str, Any], path: str) -> None:
+    """Write the artifact as compact JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, separators=(",", ":"), ensure_ascii=False)
+
+
+class CompiledRuleset:
+    """Scores text straight from a compiled artifact
+
+    Produces the same verdict, confidence and per-stage scores as
+    ``detect_content`` on the detector the artifact was compiled from.
+    """
+
+    def __init__(self, artifact: Dict[str, Any]):
+        if artifact.get("format") != ARTIFACT_FORMAT:
+            raise ValueError("Not a compiled ruleset artifact")
+        if artifact.get("format_version") != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported artifact version: {artifact.get('format_version')}")
+
+        self.version = artifact["ruleset_version"]
+        self.categories = artifact["categories"]
+        self.context_categories = artifact["context_categories"]
+        self.similarity_categories = artifact["similarity_categories"]
+        self.weights = artifact["weights"]
+        self.threshold = artifact["threshold"]
+        self.hit_scores = artifact["hit_scores"]
+        self.patterns = [(index, re.compile(source, re.IGNORECASE))
+                         for index, source in artifact["patterns"]]
+        self.keywords = artifact["keywords"]
+        self.keyword_targets = artifact["keyword_targets"]
+        self.goto = artifact["automaton"]["goto"]
+        self.fail = artifact["automaton"]["fail"]
+        self.output = artifact["automaton"]["output"]
+        self.references = artifact["references"]
+
+    def find_keywords(self, text: str) -> set:
+        """Ids of every keyword that occurs in text"""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            found.update(self.output[state])
+        return found
+
+    def detect_content(self, text: str) -> Dict[str, Any]:
+        """Score text; same result layout as the detectors (without spaCy)"""
+        text = re.sub(r'\s+', ' ', text.lower().strip())
+
+        pattern_hits = [0] * len(self.categories)
+        for index, regex in self.patterns:
+            if regex.search(text):
+                pattern_hits[index] += 1
+
+        context_hits = [0] * len(self.context_categories)
+        intent_hits = 0
+        for keyword in self.find_keywords(text):
+            for kind, index in self.keyword_targets[keyword]:
+                if kind == KIND_CONTEXT:
+                    context_hits[index] += 1
+                else:
+                    intent_hits += 1
+
+        similarity = [0.0] * len(self.similarity_categories)
+        for index, reference in self.references:
+            ratio = SequenceMatcher(None, text, reference).ratio()
+            similarity[index] = max(similarity[index], ratio)
+
+        pattern_scores = {category: accumulate(pattern_hits[i], self.hit_scores["pattern"])
+                          for i, category in enumerate(self.categories)}
+        context_scores = {category: accumulate(context_hits[i], self.hit_scores["context"])
+                          for i, category in enumerate(self.context_categories)}
+        intent_score = accumulate(intent_hits, self.hit_scores["intent"])
+        similarity_scores = dict(zip(self.similarity_categories, similarity))
+
+        weights = self.weights
+        combined_scores = {
+            category: (pattern_scores.get(category, 0.0) * weights["pattern"] +
+                       context_scores.get(category, 0.0) * weights["context"] +
+                       similarity_scores.get(category, 0.0) * weights["similarity"])
+            for category in self.categories
+        }
+
+        results = {
+            "is_detected": False,
+            "category": "safe",
+            "confidence": 0.0,
+            "reason": "Content appears safe",
+            "details": {}
+        }
+        if combined_scores:
+            max_category = max(combined_scores, key=combined_scores.get)
+            final_score = min(combined_scores[max_category] + intent_score * weights["intent"], 1.0)
+            if final_score > self.threshold:
+                results["is_detected"] = True
+                results["category"] = max_category
+                results["confidence"] = final_score
+                results["reason"] = f"Detected {max_category.replace('_', ' ')} content with {final_score:.2f} confidence"
+
+        results["details"] = {
+            "pattern_scores": pattern_scores,
+            "context_scores": context_scores,
+            "intent_score": intent_score,
+            "similarity_scores": similarity_scores,
+            "combined_scores": combined_scores
+        }
+        return results
+
+
+def load_compiled_ruleset(path: str) -> CompiledRuleset:
+    """Load an artifact written by save_compiled"""
+    with open(path, "r", encoding="utf-8") as f:
+        return CompiledRuleset(json.load(f))
+
+
+def main():
+    """Build step: compile the canonical rules for the clients"""
+    parser = argparse.ArgumentParser(description="Compile detector rules into a client artifact")
+    parser.add_argument("--detector", choices=["full", "simple"], default="full")
+    parser.add_argument("--ruleset", help="ruleset JSON to compile instead of the built-in rules")
+    parser.add_argument("--output", default="compiled_ruleset.json")
+    args = parser.parse_args()
+
+    if args.detector == "simple":
+        from test_detector import SimpleContentDetector
+        detector = SimpleContentDetector()
+    else:
+        from deepfake_detector import ContentDetector
+        detector = ContentDetector(profile="lite")
+
+    if args.ruleset:
+        from ruleset import load_ruleset, apply_ruleset
+        apply_ruleset(detector, load_ruleset(args.ruleset))
+
+    artifact = compile_ruleset(detector)
+    save_compiled(artifact, args.output)
+    print(f"📦 Compiled ruleset {artifact['ruleset_version']} → {args.output}")
+    print(f"   {len(artifact['patterns'])} patterns, {len(artifact['keywords'])} keywords, "
+          f"{len(artifact['automaton']['goto'])} automaton states, "
+          f"{len(artifact['references'])} reference sentences")
+
+
+if __name__ == "__main__":
+    main()
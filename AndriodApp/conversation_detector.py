@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Conversation-Level Detection
+Scores misuse that is split across several chat messages by keeping a
+bounded sliding window per conversation and updating its per-category
+state incrementally as each message arrives
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, Tuple
+
+from rule_scores import PATTERN_HIT, CONTEXT_HIT, INTENT_HIT, accumulate
+
+class _Message:
+    """What the window remembers of one message (never the text itself)"""
+
+    __slots__ = ("timestamp", "rules", "similarity")
+
+    def __init__(self, timestamp: float, rules: Tuple[Tuple[str, str, int], ...],
+                 similarity: Dict[str, float]):
+        self.timestamp = timestamp
+        self.rules = rules
+        self.similarity = similarity
+
+
+class _Conversation:
+    """Sliding-window state of one conversation
+
+    ``rule_counts`` counts how many window messages matched each rule and
+    ``hits`` how many distinct rules of a stage/category are matched
+    anywhere in the window, so a rule split off into an earlier message
+    still counts once, as it would in the concatenated text. Similarity
+    keeps a monotonic deque per category, giving the window maximum in
+    amortized O(1).
+    """
+
+    __slots__ = ("lock", "messages", "rule_counts", "hits", "similarity_max", "last_seen", "sequence")
+
+    def __init__(self, now: float):
+        self.lock = threading.Lock()
+        self.messages: deque = deque()
+        self.rule_counts: Dict[Tuple[str, str, int], int] = {}
+        self.hits: Dict[Tuple[str, str], int] = {}
+        self.similarity_max: Dict[str, deque] = {}
+        self.last_seen = now
+        self.sequence = 0
+
+    def push(self, message: _Message) -> None:
+        for rule in message.rules:
+            count = self.rule_counts.get(rule, 0)
+            if count == 0:
+                self.hits[rule[:2]] = self.hits.get(rule[:2], 0) + 1
+            self.rule_counts[rule] = count + 1
+        self.sequence += 1
+        for category, score in message.similarity.items():
+            window = self.similarity_max.setdefault(category, deque())
+            while window and window[-1][1] <= score:
+                window.pop()
+            window.append((self.sequence, score))
+        self.messages.append(message)
+
+    def pop(self) -> None:
+        message = self.messages.popleft()
+        for rule in message.rules:
+            count = self.rule_counts.pop(rule) - 1
+            if count:
+                self.rule_counts[rule] = count
+            else:
+                remaining = self.hits.pop(rule[:2]) - 1
+                if remaining:
+                    self.hits[rule[:2]] = remaining
+        oldest = self.sequence - len(self.messages)
+        for window in self.similarity_max.values():
+            if window and window[0][0] <= oldest:
+                window.popleft()
+
+
+class ConversationDetector:
+    """Detects misuse across the recent messages of many conversations
+
+    Each message is scored once. Its matched rules and similarity scores
+    are added to the conversation's window and the oldest message's are
+    removed, so the work per message does not grow with the window or the
+    conversation length. A window holds at most ``window_messages``
+    messages (and, with ``window_seconds``, only recent ones), idle
+    conversations are evicted after ``idle_timeout_s`` and at most
+    ``max_conversations`` are kept, least recently active evicted first.
+    Messages of different conversations can be added from any number of
+    threads.
+    """
+
+    def __init__(self, detector=None, window_messages: int = 8, window_seconds: float = None,
+                 idle_timeout_s: float = 900.0, max_conversations: int = 10000, clock=time.monotonic):
+        """Wrap ``detector`` (a lite ContentDetector by default)"""
+        if detector is None:
+            from deepfake_detector import ContentDetector
+            detector = ContentDetector(profile="lite")
+        if window_messages < 1:
+            raise ValueError("window_messages must be at least 1")
+        self.detector = detector
+        self.window_messages = window_messages
+        self.window_seconds = window_seconds
+        self.idle_timeout_s = idle_timeout_s
+        self.max_conversations = max_conversations
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self.stats = {"messages": 0, "detections": 0, "split_detections": 0, "evicted": 0}
+
+    def _match_rules(self, text: str) -> Tuple[Tuple[str, str, int], ...]:
+        """(stage, category, rule index) of every rule the text matches"""
+        detector = self.detector
+        rules = []
+        for category, patterns in detector.compiled_patterns().items():
+            for index, regex in enumerate(patterns):
+                if regex.search(text):
+                    rules.append(("pattern", category, index))
+        for category, words in detector.malicious_context_words.items():
+            for index, word in enumerate(words):
+                if word in text:
+                    rules.append(("context", category, index))
+        for index, indicator in enumerate(detector.intent_indicators):
+            if indicator in text:
+                rules.append(("intent", "", index))
+        return tuple(rules)
+
+    def _combine(self, hits: Dict[Tuple[str, str], int], similarity: Dict[str, float]) -> Dict[str, Any]:
+        detector = self.detector
+        pattern_scores = {category: accumulate(hits.get(("pattern", category), 0), PATTERN_HIT)
+                          for category in detector.patterns}
+        context_scores = {category: accumulate(hits.get(("context", category), 0), CONTEXT_HIT)
+                          for category in detector.malicious_context_words}
+        intent_score = accumulate(hits.get(("intent", ""), 0), INTENT_HIT)
+        return detector.combine_scores(pattern_scores, context_scores, intent_score, similarity)
+
+    def _conversation(self, conversation_id: str, now: float) -> _Conversation:
+        with self._lock:
+            conversation = self._conversations.get(conversation_id)
+            if conversation is None:
+                conversation = _Conversation(now)
+                self._conversations[conversation_id] = conversation
+                while len(self._conversations) > self.max_conversations:
+                    self._conversations.popitem(last=False)
+                    self.stats["evicted"] += 1
+            else:
+                self._conversations.move_to_end(conversation_id)
+            conversation.last_seen = now
+            return conversation
+
+    def add_message(self, conversation_id: str, text: str, timestamp: float = None) -> Dict[str, Any]:
+        """Score a new message in the context of its conversation's window
+
+        Returns the verdict over the window in the usual result layout.
+        ``details["message_detected"]`` is the verdict of the message alone
+        and ``details["split_across_messages"]`` is set when only the window
+        is detected.
+        """
+        now = self.clock() if timestamp is None else timestamp
+        prepared = self.detector.prepare_text(text)
+        rules = self._match_rules(prepared.text)
+        similarity = self.detector.check_reference_similarity(prepared)
+
+        message_hits: Dict[Tuple[str, str], int] = {}
+        for rule in rules:
+            message_hits[rule[:2]] = message_hits.get(rule[:2], 0) + 1
+        message_detected = self._combine(message_hits, similarity)["is_detected"]
+
+        result = None
+        while result is None:
+            conversation = self._conversation(conversation_id, now)
+            with conversation.lock:
+                with self._lock:
+                    evicted = self._conversations.get(conversation_id) is not conversation
+                if evicted:
+                    # Evicted between the lookup and the lock; a message
+                    # pushed now would be lost, so look it up again
+                    continue
+                conversation.push(_Message(now, rules, similarity))
+                while len(conversation.messages) > self.window_messages:
+                    conversation.pop()
+                if self.window_seconds is not None:
+                    while now - conversation.messages[0].timestamp > self.window_seconds:
+                        conversation.pop()
+                window_similarity = {category: window[0][1] if window else 0.0
+                                     for category, window in conversation.similarity_max.items()}
+                result = self._combine(conversation.hits, window_similarity)
+                result["details"]["window_messages"] = len(conversation.messages)
+
+        result["details"]["message_detected"] = message_detected
+        result["details"]["split_across_messages"] = result["is_detected"] and not message_detected
+        with self._lock:
+            self.stats["messages"] += 1
+            self.stats["detections"] += result["is_detected"]
+            self.stats["split_detections"] += result["details"]["split_across_messages"]
+        return result
+
+    def end_conversation(self, conversation_id: str) -> None:
+        """Drop a conversation's window"""
+        with self._lock:
+            self._conversations.pop(conversation_id, None)
+
+    def evict_idle(self, now: float = None) -> int:
+        """Drop conversations idle for longer than ``idle_timeout_s``; returns how many"""
+        now = self.clock() if now is None else now
+        evicted = 0
+        with self._lock:
+            # Least recently active first, so stop at the first active one
+            while self._conversations:
+                conversation_id, conversation = next(iter(self._conversations.items()))
+                if now - conversation.last_seen <= self.idle_timeout_s:
+                    break
+                del self._conversations[conversation_id]
+                evicted += 1
+            self.stats["evicted"] += evicted
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Message, detection and eviction counters plus live conversations"""
+        with self._lock:
+            return dict(self.stats, conversations=len(self._conversations))
+
+
+def main():
+    """Demo: a request split over several messages of one chat"""
+    detector = ConversationDetector(window_messages=4)
+    chat = [
+        "i want to make a deepfake of my boss",
+        "how to swap his face into a video",
+        "then face replacement so it looks real",
+        "what tools do i need"
+    ]
+    print("💬 CONVERSATION-LEVEL DETECTION DEMO")
+    print("=" * 60)
+    for text in chat:
+        result = detector.add_message("chat-1", text)
+        single = "detected" if result["details"]["message_detected"] else "safe"
+        window = f"DETECTED ({result['category']}, {result['confidence']:.2f})" if result["is_detected"] else "safe"
+        print(f"'{text}'\n   message alone: {single}, window: {window}")
+    print(f"\n📊 {detector.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Corpus Scanner
+Scans multi-GB newline-delimited dumps by memory-mapping the file and
+splitting it into shards at newline byte offsets; workers get offsets, not
+copied strings, and every result carries the byte offset of its line
+"""
+
+import argparse
+import gc
+import json
+import mmap
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from columnar_results import ColumnarWriter, result_columns
+
+# (byte offset, is_detected, category, confidence) per scanned line
+ScanResult = Tuple[int, bool, str, float]
+
+# Set in the parent before forking, inherited by every worker
+_WORKER_DETECTOR = None
+
+# Upper bound on a shard, so no worker holds results for more than this
+# much text at once whatever the corpus size
+MAX_SHARD_BYTES = 64 * 1024 * 1024
+
+
+def shard_offsets(path: str, shards: int) -> List[Tuple[int, int]]:
+    """Split a file into about ``shards`` byte ranges that end on newlines"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for shard in range(1, shards):
+            target = max(size * shard // shards, bounds[-1])
+            newline = mapped.find(b"\n", target)
+            if newline == -1:
+                break
+            if newline + 1 > bounds[-1]:
+                bounds.append(newline + 1)
+    if bounds[-1] != size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_lines(mapped, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+    """(offset, line) for every non-empty line in ``mapped[start:end]``"""
+    position = start
+    while position < end:
+        newline = mapped.find(b"\n", position, end)
+        stop = end if newline == -1 else newline
+        line = mapped[position:stop].rstrip(b"\r")
+        if line.strip():
+            yield position, line
+        position = stop + 1
+
+
+def scan_shard(detector, path: str, start: int, end: int, detected_only: bool = False) -> Iterator[ScanResult]:
+    """Score the lines of one byte range; only the line being scored is copied"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset, line in iter_lines(mapped, start, end):
+            result = detector.detect_content(line.decode("utf-8", errors="replace"))
+            if result["is_detected"] or not detected_only:
+                yield offset, result["is_detected"], result["category"], result["confidence"]
+
+
+def write_part(results: Iterable[ScanResult], part_path: str) -> str:
+    """Stream shard results to a tab-separated part file as they are scored"""
+    with open(part_path, "w", encoding="utf-8") as f:
+        for offset, is_detected, category, confidence in results:
+            # repr() round-trips the float exactly
+            f.write(f"{offset}\t{int(is_detected)}\t{category}\t{confidence!r}\n")
+    return part_path
+
+
+def read_part(part_path: str) -> Iterator[ScanResult]:
+    """Results written by write_part, in file order"""
+    with open(part_path, "r", encoding="utf-8") as f:
+        for line in f:
+            offset, is_detected, category, confidence = line.rstrip("\n").split("\t")
+            yield int(offset), is_detected == "1", category, float(confidence)
+
+
+def scan_shard_columns(detector, path: str, start: int, end: int) -> Dict[str, np.ndarray]:
+    """Score one byte range into columnar arrays (see columnar_results.py)"""
+    results = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset, line in iter_lines(mapped, start, end):
+            results.append((offset, detector.detect_content(line.decode("utf-8", errors="replace"))))
+    return result_columns(results, list(detector.patterns.keys()))
+
+
+def _scan(task: Tuple[str, int, int, bool, str]) -> str:
+    path, start, end, detected_only, part_path = task
+    return write_part(scan_shard(_WORKER_DETECTOR, path, start, end, detected_only), part_path)
+
+
+def _scan_columns(task: Tuple[str, int, int]) -> Dict[str, np.ndarray]:
+    return scan_shard_columns(_WORKER_DETECTOR, *task)
+
+
+class CorpusScanner:
+    def __init__(self, detector_factory: Callable = None, workers: int = None):
+        """Build the detector once, then fork ``workers`` workers that share it
+
+        As in ``PreforkDetectorPool`` the loaded detector is moved to the
+        permanent GC generation before forking, so workers do not copy it.
+        """
+        global _WORKER_DETECTOR
+
+        if detector_factory is None:
+            from deepfake_detector import ContentDetector
+            detector_factory = lambda: ContentDetector(profile="lite")
+
+        detector = detector_factory()
+        detector.detect_content("warm up the detector before forking")
+        self.detector = detector
+        self.workers = workers or os.cpu_count() or 1
+        _WORKER_DETECTOR = detector
+
+        gc.collect()
+        gc.freeze()
+        self._pool = multiprocessing.get_context("fork").Pool(self.workers)
+        gc.unfreeze()
+
+    def _shards(self, path: str, shards: int = None) -> List[Tuple[int, int]]:
+        # 4 per worker by default, more when that would exceed MAX_SHARD_BYTES
+        shards = max(shards or self.workers * 4, -(-os.path.getsize(path) // MAX_SHARD_BYTES))
+        return shard_offsets(path, shards)
+
+    def scan(self, path: str, shards: int = None, detected_only: bool = False) -> Iterator[ScanResult]:
+        """Yield results in file order; each worker maps the file and reads its own shard
+
+        Workers stream their results to a part file per shard instead of
+        returning them, and parts are read back one at a time, so neither
+        side holds a shard's results in memory.
+        """
+        with tempfile.TemporaryDirectory(prefix="corpus-scan-") as directory:
+            tasks = [(path, start, end, detected_only, os.path.join(directory, f"{shard:06d}.part"))
+                     for shard, (start, end) in enumerate(self._shards(path, shards))]
+            for part_path in self._pool.imap(_scan, tasks):
+                yield from read_part(part_path)
+                os.remove(part_path)
+
+    def scan_columns(self, path: str, shards: int = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield one columnar chunk per shard, in file order
+
+        Workers send back a few numpy arrays per shard instead of one
+        tuple per line, which is cheaper to pickle and to write.
+        """
+        tasks = [(path, start, end) for start, end in self._shards(path, shards)]
+        yield from self._pool.imap(_scan_columns, tasks)
+
+    def close(self) -> None:
+        """Stop the workers"""
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """Scan a newline-delimited corpus into JSON lines or columnar files"""
+    parser = argparse.ArgumentParser(description="Memory-mapped parallel scan of a text corpus")
+    parser.add_argument("corpus", help="text file with one message per line")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shards", type=int, help="byte-range shards (default 4 per worker)")
+    parser.add_argument("--detector", choices=["lite", "simple"], default="lite")
+    parser.add_argument("--detected-only", action="store_true", help="only report detected lines")
+    parser.add_argument("--output", help="JSONL file for results")
+    parser.add_argument("--columnar", help="directory for memory-mappable columnar results")
+    args = parser.parse_args()
+
+    factory = None
+    if args.detector == "simple":
+        from test_detector import SimpleContentDetector
+        factory = SimpleContentDetector
+
+    size = os.path.getsize(args.corpus)
+    start = time.perf_counter()
+    scanned = detected = 0
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        with CorpusScanner(factory, workers=args.workers) as scanner:
+            if args.columnar:
+                with ColumnarWriter(args.columnar, list(scanner.detector.patterns.keys())) as writer:
+                    for chunk in scanner.scan_columns(args.corpus, args.shards):
+                        writer.append_columns(chunk)
+                        scanned += len(chunk["offset"])
+                        detected += int(chunk["is_detected"].sum())
+            else:
+                for offset, is_detected, category, confidence in scanner.scan(
+                        args.corpus, args.shards, args.detected_only):
+                    scanned += 1
+                    detected += is_detected
+                    if output:
+                        output.write(json.dumps({"offset": offset, "is_detected": is_detected,
+                                                 "category": category, "confidence": confidence}) + "\n")
+    finally:
+        if output:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"📚 Scanned {size / 1e6:.1f} MB with {args.workers} workers in {elapsed:.2f}s "
+          f"({size / 1e6 / elapsed:.1f} MB/s)")
+    if args.detected_only:
+        print(f"   {detected} detected lines")
+    else:
+        print(f"   {scanned} lines, {detected} detected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Detection Traffic Analytics
+Fixed-memory live counters of detection events by app and category over a
+sliding time window, plus heavy-hitter sketches of the categories whose
+patterns matched most and of the most frequent phrases, with exportable
+snapshots for dashboards
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Any, Iterable, Tuple
+
+from prepared_text import PreparedText
+
+# Phrases are truncated so one long message cannot hold a large sketch slot
+MAX_PHRASE_LENGTH = 80
+
+
+class HeavyHitters:
+    """Misra-Gries sketch of the most frequent keys in at most ``capacity`` counters
+
+    Every key seen more than ``total / (capacity + 1)`` times is kept, and a
+    kept count is low by at most that much. Updates are amortized O(1):
+    the occasional decrement of all counters is paid for by the
+    increments that filled them.
+    """
+
+    __slots__ = ("capacity", "counters", "total")
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self.counters: Dict[Any, int] = {}
+        self.total = 0
+
+    def add(self, key, count: int = 1) -> None:
+        self.total += count
+        counters = self.counters
+        if key in counters or len(counters) < self.capacity:
+            counters[key] = counters.get(key, 0) + count
+            return
+        # Full: charge the new key against every counter
+        smallest = min(min(counters.values()), count)
+        for existing in list(counters):
+            counters[existing] -= smallest
+            if counters[existing] == 0:
+                del counters[existing]
+        if count > smallest:
+            counters[key] = count - smallest
+
+    def merge(self, other: "HeavyHitters") -> None:
+        """Fold another sketch into this one (used to combine time buckets)"""
+        self.total += other.total
+        for key, count in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + count
+        if len(self.counters) > self.capacity:
+            cutoff = sorted(self.counters.values(), reverse=True)[self.capacity]
+            self.counters = {key: count - cutoff for key, count in self.counters.items() if count > cutoff}
+
+    def top(self, n: int = None) -> List[Tuple[Any, int]]:
+        """Keys by estimated count, largest first"""
+        ranked = sorted(self.counters.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:n] if n else ranked
+
+    def get(self, key, default: int = 0) -> int:
+        return self.counters.get(key, default)
+
+    def clear(self) -> None:
+        self.counters.clear()
+        self.total = 0
+
+
+class _Bucket:
+    """Counts of one time slice of the window"""
+
+    __slots__ = ("epoch", "events", "detections", "categories", "apps", "app_detections")
+
+    def __init__(self, capacity: int):
+        self.epoch = -1
+        self.events = 0
+        self.detections = 0
+        self.categories: Dict[str, int] = {}
+        self.apps = HeavyHitters(capacity)
+        self.app_detections = HeavyHitters(capacity)
+
+    def reset(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.events = 0
+        self.detections = 0
+        self.categories.clear()
+        self.apps.clear()
+        self.app_detections.clear()
+
+
+def pattern_categories(result: Dict[str, Any]) -> List[str]:
+    """Categories whose patterns matched, as already scored in ``result``"""
+    return [category for category, score in result.get("details", {}).get("pattern_scores", {}).items()
+            if score > 0.0]
+
+
+class DetectionAnalytics:
+    """Live detection counters in fixed memory
+
+    The window of ``window_seconds`` is a ring of ``buckets`` time slices.
+    Each slice holds event and detection totals, counts per category and
+    sketches of the busiest apps, so memory depends on ``buckets`` and
+    ``top_k`` rather than on traffic. The categories whose patterns matched
+    most and the top phrases are tracked since start in their own sketches.
+    ``record`` is O(1) per event; ``snapshot`` merges the slices.
+    """
+
+    def __init__(self, window_seconds: float = 300.0, buckets: int = 60, top_k: int = 32,
+                 clock=time.time):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = window_seconds / buckets
+        self.top_k = top_k
+        self.clock = clock
+        self._buckets = [_Bucket(top_k) for _ in range(buckets)]
+        self.pattern_categories = HeavyHitters(top_k)
+        self.phrases = HeavyHitters(top_k)
+        self.totals = {"events": 0, "detections": 0}
+        self._lock = threading.Lock()
+
+    def record(self, app: str, category: str, detected: bool, pattern_categories: Iterable[str] = (),
+               phrase: str = None, now: float = None) -> None:
+        """Count one detection event"""
+        now = self.clock() if now is None else now
+        epoch = int(now // self.bucket_seconds)
+        with self._lock:
+            bucket = self._buckets[epoch % len(self._buckets)]
+            if bucket.epoch != epoch:
+                bucket.reset(epoch)
+            bucket.events += 1
+            bucket.categories[category] = bucket.categories.get(category, 0) + 1
+            bucket.apps.add(app)
+            self.totals["events"] += 1
+            if detected:
+                bucket.detections += 1
+                bucket.app_detections.add(app)
+                self.totals["detections"] += 1
+                for matched in pattern_categories:
+                    self.pattern_categories.add(matched)
+                if phrase:
+                    self.phrases.add(PreparedText.of(phrase).text[:MAX_PHRASE_LENGTH])
+
+    def record_result(self, app: str, text: str, result: Dict[str, Any], now: float = None) -> None:
+        """Count a ``detect_content`` result and the categories its patterns matched
+
+        The matches come from the result's ``pattern_scores``; no rule is
+        evaluated again.
+        """
+        detected = bool(result.get("is_detected"))
+        matched = pattern_categories(result) if detected else ()
+        self.record(app, result.get("category", "safe"), detected, matched, text, now)
+
+    def snapshot(self, now: float = None) -> Dict[str, Any]:
+        """Window and all-time counters as plain JSON-ready data"""
+        now = self.clock() if now is None else now
+        current = int(now // self.bucket_seconds)
+        oldest = current - len(self._buckets) + 1
+        events = detections = 0
+        categories: Dict[str, int] = {}
+        apps = HeavyHitters(self.top_k)
+        app_detections = HeavyHitters(self.top_k)
+        with self._lock:
+            for bucket in self._buckets:
+                if not oldest <= bucket.epoch <= current:
+                    continue
+                events += bucket.events
+                detections += bucket.detections
+                for category, count in bucket.categories.items():
+                    categories[category] = categories.get(category, 0) + count
+                apps.merge(bucket.apps)
+                app_detections.merge(bucket.app_detections)
+            top_pattern_categories = self.pattern_categories.top()
+            top_phrases = self.phrases.top()
+            totals = dict(self.totals)
+
+        return {
+            "timestamp": now,
+            "window_seconds": self.window_seconds,
+            "window": {
+                "events": events,
+                "detections": detections,
+                "detection_rate": detections / events if events else 0.0,
+                "categories": categories,
+                "apps": [{"app": app, "events": count, "detections": app_detections.get(app)}
+                         for app, count in apps.top()]
+            },
+            "totals": totals,
+            "top_pattern_categories": [{"category": category, "count": count}
+                                       for category, count in top_pattern_categories],
+            "top_phrases": [{"phrase": phrase, "count": count} for phrase, count in top_phrases]
+        }
+
+    def export(self, path: str, now: float = None) -> Dict[str, Any]:
+        """Write a snapshot as JSON and return it"""
+        snapshot = self.snapshot(now)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2)
+        return snapshot
+
+
+def print_snapshot(snapshot: Dict[str, Any]) -> None:
+    """Print a dashboard-style summary of a snapshot"""
+    window = snapshot["window"]
+    print(f"📊 Last {snapshot['window_seconds']:.0f}s: {window['events']} events, "
+          f"{window['detections']} detections ({window['detection_rate']:.0%})")
+    print("\n📈 DETECTION STATS BY APP:")
+    for entry in window["apps"]:
+        print(f"  • {entry['app']}: {entry['events']} events, {entry['detections']} detections")
+    print("\n🏷️  BY CATEGORY:")
+    for category, count in sorted(window["categories"].items(), key=lambda item: -item[1]):
+        print(f"  • {category}: {count}")
+    if snapshot["top_pattern_categories"]:
+        print("\n🔝 TOP MATCHED PATTERN CATEGORIES:")
+        for entry in snapshot["top_pattern_categories"][:10]:
+            print(f"  • {entry['category']}: ~{entry['count']}")
+    if snapshot["top_phrases"]:
+        print("\n💬 TOP PHRASES:")
+        for entry in snapshot["top_phrases"][:10]:
+            print(f"  • '{entry['phrase']}': ~{entry['count']}")
+
+
+def main():
+    """Replay the demo traffic mix through the detector and print the dashboard"""
+    import argparse
+    from deepfake_detector import ContentDetector
+    from load_generator import load_mix, build_workload
+
+    parser = argparse.ArgumentParser(description="Live detection analytics over replayed traffic")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--top-k", type=int, default=32)
+    parser.add_argument("--export", help="write the snapshot as JSON to this path")
+    args = parser.parse_args()
+
+    detector = ContentDetector(profile="lite")
+    analytics = DetectionAnalytics(top_k=args.top_k)
+    apps, phrases = load_mix("all")
+    start = time.perf_counter()
+    for app, text in build_workload(apps, phrases, args.messages, keystrokes=False):
+        analytics.record_result(app, text, detector.detect_content(text))
+    elapsed = time.perf_counter() - start
+
+    print("📡 DETECTION TRAFFIC ANALYTICS")
+    print("=" * 60)
+    print(f"{args.messages} messages replayed in {elapsed:.2f}s\n")
+    if args.export:
+        print_snapshot(analytics.export(args.export))
+        print(f"\n💾 Snapshot written to {args.export}")
+    else:
+        print_snapshot(analytics.snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -45,28 +45,150 @@
     )
 
     /**
-     * Ultra-fast pattern matching optimized for minimal delay
-     * Uses pre-compiled patterns for instant detection
+     * Rules compiled from the canonical Python detector by compiled_ruleset.py
+     * (`python compiled_ruleset.py --output app/src/main/assets/compiled_ruleset.json`).
+     * The regex table and the Aho-Corasick goto/fail/output tables are used as
+     * shipped; nothing is rebuilt from hand-maintained lists at runtime.
+     * Scores the pattern, context and intent stages exactly like the artifact's
+     * Python loader; reference similarity is left to the full analysis.
      */
-    fun fastAnalyzePatterns(prompt: String): PatternAnalysisResult {
+    data class CompiledScore(val combined: Map<String, Double>, val category: String?, val confidence: Double)
+
+    class CompiledRuleset(artifact: org.json.JSONObject) {
+        val version: String
+        val categories: List<String>
+        private val contextCategories: List<String>
+        private val weights: Map<String, Double>
+        private val threshold: Double
+        private val hitScores: Map<String, Double>
+        private val patterns: List<Pair<Int, Regex>>
+        private val keywordTargets: List<List<IntArray>>
+        private val goto: List<Map<Char, Int>>
+        private val fail: IntArray
+        private val output: List<IntArray>
+
+        init {
+            require(artifact.getString("format") == "neurogate-compiled-ruleset") { "Not a compiled ruleset artifact" }
+            require(artifact.getInt("format_version") == 1) {
+                "Unsupported artifact version: ${artifact.getInt("format_version")}"
+            }
+            version = artifact.getString("ruleset_version")
+            categories = artifact.getJSONArray("categories").let { a -> List(a.length()) { a.getString(it) } }
+            contextCategories = artifact.getJSONArray("context_categories").let { a -> List(a.length()) { a.getString(it) } }
+            weights = artifact.getJSONObject("weights").let { o -> o.keys().asSequence().associateWith { o.getDouble(it) } }
+            threshold = artifact.getDouble("threshold")
+            hitScores = artifact.getJSONObject("hit_scores").let { o -> o.keys().asSequence().associateWith { o.getDouble(it) } }
+            patterns = artifact.getJSONArray("patterns").let { a ->
+                List(a.length()) {
+                    val entry = a.getJSONArray(it)
+                    entry.getInt(0) to Regex(entry.getString(1), RegexOption.IGNORE_CASE)
+                }
+            }
+            keywordTargets = artifact.getJSONArray("keyword_targets").let { a ->
+                List(a.length()) { k ->
+                    val targets = a.getJSONArray(k)
+                    List(targets.length()) { t ->
+                        val target = targets.getJSONArray(t)
+                        intArrayOf(target.getInt(0), target.getInt(1))
+                    }
+                }
+            }
+            val automaton = artifact.getJSONObject("automaton")
+            goto = automaton.getJSONArray("goto").let { a ->
+                List(a.length()) { state ->
+                    val edges = a.getJSONObject(state)
+                    edges.keys().asSequence().associate { it[0] to edges.getInt(it) }
+                }
+            }
+            fail = automaton.getJSONArray("fail").let { a -> IntArray(a.length()) { a.getInt(it) } }
+            output = automaton.getJSONArray("output").let { a ->
+                List(a.length()) { state -> a.getJSONArray(state).let { o -> IntArray(o.length()) { o.getInt(it) } } }
+            }
+        }
+
+        /** Ids of every keyword that occurs in the normalized text, in one pass */
+        private fun findKeywords(text: String): Set<Int> {
+            val found = HashSet<Int>()
+            var state = 0
+            for (char in text) {
+                while (state != 0 && char !in goto[state]) state = fail[state]
+                state = goto[state][char] ?: 0
+                output[state].forEach { found.add(it) }
+            }
+            return found
+        }
+
+        // Repeated addition, like the Python detectors, keeps scores identical
+        private fun accumulate(hits: Int, step: Double): Double {
+            var score = 0.0
+            repeat(hits) { score += step }
+            return minOf(score, 1.0)
+        }
+
+        /** Combined score per category and the verdict, without reference similarity */
+        fun score(prompt: String): CompiledScore {
+            val text = prompt.lowercase().trim().replace(WHITESPACE, " ")
+
+            val patternHits = IntArray(categories.size)
+            for ((index, regex) in patterns) {
+                if (regex.containsMatchIn(text)) patternHits[index]++
+            }
+            val contextHits = IntArray(contextCategories.size)
+            var intentHits = 0
+            for (keyword in findKeywords(text)) {
+                for (target in keywordTargets[keyword]) {
+                    if (target[0] == KIND_CONTEXT) contextHits[target[1]]++ else intentHits++
+                }
+            }
+
+            val combined = LinkedHashMap<String, Double>()
+            categories.forEachIndexed { index, category ->
+                val context = contextCategories.indexOf(category).let { if (it < 0) 0 else contextHits[it] }
+                combined[category] = accumulate(patternHits[index], hitScores.getValue("pattern")) * weights.getValue("pattern") +
+                    accumulate(context, hitScores.getValue("context")) * weights.getValue("context")
+            }
+            val best = combined.maxByOrNull { it.value } ?: return CompiledScore(combined, null, 0.0)
+            val final = minOf(best.value + accumulate(intentHits, hitScores.getValue("intent")) * weights.getValue("intent"), 1.0)
+            return if (final > threshold) CompiledScore(combined, best.key, final) else CompiledScore(combined, null, 0.0)
+        }
+
+        companion object {
+            private const val KIND_CONTEXT = 0
+            private val WHITESPACE = Regex("\\s+")
+        }
+    }
+
+    // Read from assets once, on the first fast analysis, with the host class's
+    // `context` (RealAIService / RealTimeDetectionService); null when the asset
+    // is missing or unreadable, which falls back to the keyword quick screen
+    private val compiledRuleset: CompiledRuleset? by lazy { loadCompiledRuleset(context) }
+
+    fun loadCompiledRuleset(context: android.content.Context, asset: String = "compiled_ruleset.json"): CompiledRuleset? =
+        try {
+            val json = context.assets.open(asset).bufferedReader().use { it.readText() }
+            CompiledRuleset(org.json.JSONObject(json))
+        } catch (e: Exception) {
+            android.util.Log.e("NeuroGate-Patterns", "Compiled ruleset unavailable, using keyword quick screen", e)
+            null
+        }
+
+    // Keyword quick screen, used only while no compiled ruleset is available
+    private val HIGH_CONFIDENCE_PATTERNS = setOf(
+        "hack into", "break into", "kill", "murder", "bomb", "explosive",
+        "steal", "fake", "forge", "cheat", "scam", "poison", "detonate",
+        "weapon", "gun", "knife", "attack", "assault", "hurt", "disable",
+        "jailbreak", "hotwire", "pick lock", "bypass", "counterfeit",
+        "credit card", "clone", "impersonate", "drug", "cannabis",
+        "heroin", "cocaine", "meth", "ecstasy", "smuggle", "malware",
+        "virus", "trojan", "ransomware", "spyware", "phishing",
+        "blackmail", "sabotage", "escape", "sneak", "run away",
+        "get caught", "without permission", "illegally", "anonymously",
+        "secretly", "quietly"
+    )
+
+    private fun quickScreen(prompt: String): PatternAnalysisResult {
         val lowerPrompt = prompt.lowercase()
-        
-        // Pre-compiled high-confidence patterns for instant matching
-        val highConfidencePatterns = setOf(
-            "hack into", "break into", "kill", "murder", "bomb", "explosive",
-            "steal", "fake", "forge", "cheat", "scam", "poison", "detonate",
-            "weapon", "gun", "knife", "attack", "assault", "hurt", "disable",
-            "jailbreak", "hotwire", "pick lock", "bypass", "counterfeit",
-            "credit card", "clone", "impersonate", "drug", "cannabis",
-            "heroin", "cocaine", "meth", "ecstasy", "smuggle", "malware",
-            "virus", "trojan", "ransomware", "spyware", "phishing",
-            "blackmail", "sabotage", "escape", "sneak", "run away",
-            "get caught", "without permission", "illegally", "anonymously",
-            "secretly", "quietly"
-        )
-        
-        // Check for high-confidence patterns first (fastest)
-        val highConfidenceMatches = highConfidencePatterns.count { lowerPrompt.contains(it) }
+        val highConfidenceMatches = HIGH_CONFIDENCE_PATTERNS.count { lowerPrompt.contains(it) }
         
         if (highConfidenceMatches > 0) {
             return PatternAnalysisResult(
@@ -82,6 +204,39 @@
                 )
             )
         }
+        return analyzePatterns(prompt)
+    }
+
+    private fun misuseCategory(category: String): MisuseCategory = when (category) {
+        "deepfake_face_manipulation", "deepfake" -> MisuseCategory.DEEPFAKE_IMPERSONATION
+        "privacy_violation", "privacy" -> MisuseCategory.PERSONAL_DETAILS
+        "illegal_activities", "illegal" -> MisuseCategory.HARMFUL_CONTENT
+        else -> MisuseCategory.OTHER_MISUSE
+    }
+
+    /**
+     * Ultra-fast pattern matching optimized for minimal delay
+     * Uses the compiled ruleset tables for instant detection
+     */
+    fun fastAnalyzePatterns(prompt: String): PatternAnalysisResult {
+        val ruleset = compiledRuleset ?: return quickScreen(prompt)
+        val result = ruleset.score(prompt)
+        val detected = result.category
+        
+        if (detected != null) {
+            val scores = HashMap<MisuseCategory, Double>()
+            for ((category, score) in result.combined) {
+                val misuse = misuseCategory(category)
+                scores[misuse] = maxOf(scores[misuse] ?: 0.0, score)
+            }
+            scores[MisuseCategory.NONE] = 0.0
+            return PatternAnalysisResult(
+                isMisuse = true,
+                category = misuseCategory(detected),
+                confidence = result.confidence,
+                scores = scores
+            )
+        }
         
         // Fallback to regular analysis for edge cases
         return analyzePatterns(prompt)
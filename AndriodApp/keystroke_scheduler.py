@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Debounced Keystroke Scheduler
+Coalesces rapid input updates per app and field so detection runs when the
+user pauses typing instead of on every character
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+
+class _PendingInput:
+    """Latest unanalyzed text for one (app, field) pair"""
+
+    def __init__(self, text: str, now: float):
+        self.text = text
+        self.first_update = now
+        self.last_update = now
+        self.generation = 0
+        self.future = None
+
+
+class KeystrokeScheduler:
+    def __init__(self, detector, debounce_ms: float = 300, max_wait_ms: float = 1500,
+                 min_length: int = 3, on_result: Callable = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the scheduler
+
+        A check runs once ``debounce_ms`` pass without an update, or at the
+        latest ``max_wait_ms`` after the first unanalyzed update so that
+        continuous typing is still checked. ``on_result(app, field, text,
+        result)`` is called for every completed, non-stale check.
+        """
+        self.detector = detector
+        self.debounce = debounce_ms / 1000.0
+        self.max_wait = max_wait_ms / 1000.0
+        self.min_length = min_length
+        self.on_result = on_result
+        self.clock = clock
+
+        self._lock = threading.Condition()
+        self._pending: Dict[Tuple[str, str], _PendingInput] = {}
+        self._generations: Dict[Tuple[str, str], int] = {}
+        self._analyzed: Dict[Tuple[str, str], str] = {}
+        self._executor = None
+        self._thread = None
+        self._running = False
+        self._started_at = clock()
+
+        self.app_stats: Dict[str, Dict[str, int]] = {}
+
+    def _app_stats(self, app: str) -> Dict[str, int]:
+        if app not in self.app_stats:
+            self.app_stats[app] = {
+                "updates": 0, "analyses": 0, "cancelled": 0,
+                "skipped": 0, "detections": 0, "errors": 0
+            }
+        return self.app_stats[app]
+
+    def update(self, app: str, field: str, text: str, now: float = None) -> None:
+        """Record the current contents of an input field"""
+        now = self.clock() if now is None else now
+        key = (app, field)
+        with self._lock:
+            stats = self._app_stats(app)
+            stats["updates"] += 1
+
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = _PendingInput(text, now)
+                self._pending[key] = pending
+            else:
+                pending.text = text
+                pending.last_update = now
+                if pending.future is not None and pending.future.cancel():
+                    # The queued check would only see outdated text
+                    stats["cancelled"] += 1
+                    pending.future = None
+                    pending.first_update = now
+            pending.generation = generation
+            self._lock.notify()
+
+    def cancel(self, app: str, field: str) -> None:
+        """Drop pending work for a field, e.g. after it was cleared"""
+        key = (app, field)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._analyzed.pop(key, None)
+            pending = self._pending.pop(key, None)
+            if pending is not None and pending.future is not None and pending.future.cancel():
+                self._app_stats(app)["cancelled"] += 1
+
+    def _due_time(self, pending: _PendingInput) -> float:
+        return min(pending.last_update + self.debounce, pending.first_update + self.max_wait)
+
+    def next_deadline(self) -> Optional[float]:
+        """Clock time at which the next check becomes due"""
+        with self._lock:
+            waiting = [self._due_time(p) for p in self._pending.values() if p.future is None]
+        return min(waiting) if waiting else None
+
+    def _take_due(self, now: float) -> List[Tuple[Tuple[str, str], str, int]]:
+        """Pop every due input; caller holds the lock"""
+        due = []
+        for key, pending in list(self._pending.items()):
+            if pending.future is not None or self._due_time(pending) > now:
+                continue
+            stats = self._app_stats(key[0])
+            text = pending.text
+            if len(text.strip()) < self.min_length or text == self._analyzed.get(key):
+                stats["skipped"] += 1
+                del self._pending[key]
+                continue
+            due.append((key, text, pending.generation))
+        return due
+
+    def _run_check(self, key: Tuple[str, str], text: str, generation: int) -> Optional[Dict[str, Any]]:
+        app, field = key
+        try:
+            result = self.detector.detect_content(text)
+        except Exception:
+            with self._lock:
+                self._app_stats(app)["errors"] += 1
+                pending = self._pending.get(key)
+                if pending is not None:
+                    if self._generations.get(key) == generation:
+                        # The same text would fail again; wait for the next update
+                        del self._pending[key]
+                    else:
+                        pending.future = None
+                        pending.first_update = pending.last_update
+                        self._lock.notify()
+            return None
+        with self._lock:
+            stats = self._app_stats(app)
+            stats["analyses"] += 1
+            pending = self._pending.get(key)
+            if self._generations.get(key) != generation:
+                # Newer text arrived while this check ran; its result is stale
+                stats["cancelled"] += 1
+                if pending is not None:
+                    pending.future = None
+                    pending.first_update = pending.last_update
+                    self._lock.notify()
+                return None
+            if pending is not None:
+                del self._pending[key]
+            self._analyzed[key] = text
+            if result.get("is_detected"):
+                stats["detections"] += 1
+        if self.on_result:
+            self.on_result(app, field, text, result)
+        return result
+
+    def poll(self, now: float = None) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+        """Run every due check in the calling thread
+
+        Used for simulations and single-threaded event loops; returns
+        ``(app, field, text, result)`` for each completed check.
+        """
+        now = self.clock() if now is None else now
+        with self._lock:
+            due = self._take_due(now)
+            for key, _, _ in due:
+                self._pending[key].future = _RUNNING
+        completed = []
+        for key, text, generation in due:
+            result = self._run_check(key, text, generation)
+            if result is not None:
+                completed.append((key[0], key[1], text, result))
+        return completed
+
+    def start(self, workers: int = 2) -> None:
+        """Run checks in the background as they become due"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(max_workers=workers,
+                                                thread_name_prefix="keystroke-check")
+            self._thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background dispatcher and wait for running checks"""
+        with self._lock:
+            self._running = False
+            self._lock.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _dispatch_loop(self) -> None:
+        with self._lock:
+            while self._running:
+                now = self.clock()
+                for key, text, generation in self._take_due(now):
+                    self._pending[key].future = self._executor.submit(
+                        self._run_check, key, text, generation
+                    )
+                waiting = [self._due_time(p) for p in self._pending.values() if p.future is None]
+                timeout = max(min(waiting) - self.clock(), 0.0) if waiting else None
+                self._lock.wait(timeout)
+
+    def get_stats(self, now: float = None) -> Dict[str, Dict[str, float]]:
+        """Per-app counters plus the share of updates that caused an analysis"""
+        now = self.clock() if now is None else now
+        elapsed = max(now - self._started_at, 1e-9)
+        report = {}
+        with self._lock:
+            for app, stats in self.app_stats.items():
+                row = dict(stats)
+                row["analysis_rate"] = stats["analyses"] / stats["updates"] if stats["updates"] else 0.0
+                row["analyses_per_sec"] = stats["analyses"] / elapsed
+                report[app] = row
+        return report
+
+    def print_stats(self, now: float = None) -> None:
+        """Print the per-app analysis rate"""
+        print("\n📈 ANALYSIS RATE BY APP:")
+        for app, row in sorted(self.get_stats(now).items()):
+            print(f"  • {app}: {row['updates']} updates → {row['analyses']} analyses "
+                  f"({row['analysis_rate']:.1%}), {row['cancelled']} stale cancelled, "
+                  f"{row['detections']} detections, {row['errors']} errors")
+
+
+class _Running:
+    """Placeholder future for checks executing inside poll()"""
+
+    def cancel(self) -> bool:
+        return False
+
+
+_RUNNING = _Running()
+
+
+def simulate_typing(scheduler: KeystrokeScheduler, app: str, field: str, phrase: str,
+                    start: float, keystroke_ms: float = 120) -> float:
+    """Feed a phrase character by character on a simulated clock
+
+    Returns the time of the last keystroke.
+    """
+    now = start
+    for i in range(1, len(phrase) + 1):
+        scheduler.update(app, field, phrase[:i], now=now)
+        scheduler.poll(now)
+        now += keystroke_ms / 1000.0
+    return now
+
+
+def main():
+    """Compare per-keystroke analysis with debounced scheduling"""
+    from test_detector import SimpleContentDetector
+    from test_persistent_detection import PersistentDetectionDemo
+
+    demo = PersistentDetectionDemo()
+    # Simulated clock: every call passes an explicit time starting at 0
+    scheduler = KeystrokeScheduler(SimpleContentDetector(), clock=lambda: 0.0)
+
+    print("⌨️  DEBOUNCED KEYSTROKE SCHEDULER DEMO")
+    print("=" * 60)
+
+    now = 0.0
+    keystrokes = 0
+    for app in demo.apps:
+        for phrase in demo.test_phrases:
+            now = simulate_typing(scheduler, app, "message", phrase, now)
+            keystrokes += len(phrase)
+            # User pauses before the next message
+            now += 1.0
+            for result_app, _, text, result in scheduler.poll(now):
+                if result["is_detected"]:
+                    print(f"🚨 {result_app}: '{text}' → {result['category']}")
+            scheduler.cancel(app, "message")
+
+    print(f"\n📊 {keystrokes} keystrokes, "
+          f"{sum(s['analyses'] for s in scheduler.app_stats.values())} analyses")
+    scheduler.print_stats(now)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Typing Traffic Load Generator
+Replays the app and phrase mixes of the detection demos against the real
+detector, in process or over HTTP, and reports throughput, latency
+percentiles and per-app detection stats
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple
+
+
+def load_mix(name: str) -> Tuple[List[str], List[str]]:
+    """Apps and phrases from the demo scripts ("persistent", "aggressive",
+    "enhanced" or "all")"""
+    from test_persistent_detection import PersistentDetectionDemo
+    from test_aggressive_detection import AggressiveDetectionDemo
+    from test_enhanced_detection import EnhancedDetectionDemo
+
+    demos = {
+        "persistent": PersistentDetectionDemo,
+        "aggressive": AggressiveDetectionDemo,
+        "enhanced": EnhancedDetectionDemo
+    }
+    selected = list(demos.values()) if name == "all" else [demos[name]]
+
+    apps, phrases = [], []
+    for demo_class in selected:
+        demo = demo_class()
+        for app in getattr(demo, "apps", None) or demo.detected_apps:
+            if app not in apps:
+                apps.append(app)
+        for phrase in demo.test_phrases:
+            if phrase not in phrases:
+                phrases.append(phrase)
+    return apps, phrases
+
+
+class InProcessTarget:
+    """Calls detect_content on a detector in this process"""
+
+    def __init__(self, detector, deadline_ms: float = None):
+        self.detector = detector
+        self.deadline_ms = deadline_ms
+
+    def detect(self, text: str) -> Dict[str, Any]:
+        if self.deadline_ms is not None:
+            return self.detector.detect_content(text, deadline_ms=self.deadline_ms)
+        return self.detector.detect_content(text)
+
+
+class HttpTarget:
+    """POSTs each message to a local detection service
+
+    The request is ``POST <url>`` with ``Content-Type: application/json``
+    and the body ``{"text": "<message>"}``. The service answers 200 with a
+    JSON object in the ``detect_content`` layout. Only ``is_detected`` is
+    read and a missing key counts as not detected. Non-2xx statuses,
+    timeouts and bodies that are not JSON are recorded as errors.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def detect(self, text: str) -> Dict[str, Any]:
+        request = urllib.request.Request(
+            self.url, data=json.dumps({"text": text}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+
+def build_workload(apps: List[str], phrases: List[str], messages: int,
+                   keystrokes: bool, min_length: int = 3, seed: int = 0) -> List[Tuple[str, str]]:
+    """(app, text) requests in send order
+
+    In keystroke mode every message is replayed as the growing prefixes a
+    text watcher sees while the user types it.
+    """
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(messages):
+        app = rng.choice(apps)
+        phrase = rng.choice(phrases)
+        if keystrokes:
+            workload.extend((app, phrase[:i]) for i in range(min_length, len(phrase) + 1))
+        else:
+            workload.append((app, phrase))
+    return workload
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class LoadGenerator:
+    def __init__(self, target, qps: float = 0.0, concurrency: int = 4):
+        """Drive ``target`` with ``concurrency`` workers
+
+        With ``qps`` > 0 requests are sent open-loop on a fixed schedule and
+        latency is measured from the scheduled send time, so queueing delay
+        is included when the target falls behind. With ``qps`` = 0 workers
+        send back to back as fast as the target answers.
+        """
+        self.target = target
+        self.qps = qps
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self.records: List[Dict[str, Any]] = []
+
+    def _send(self, app: str, text: str, scheduled: float = None) -> None:
+        if scheduled is not None:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        started = time.perf_counter()
+        if scheduled is None:
+            scheduled = started
+        error = None
+        detected = False
+        try:
+            detected = bool(self.target.detect(text).get("is_detected"))
+        except Exception as e:
+            error = str(e)
+        finished = time.perf_counter()
+        with self._lock:
+            self.records.append({
+                "app": app,
+                "detected": detected,
+                "error": error,
+                "service_ms": (finished - started) * 1000,
+                "latency_ms": (finished - min(scheduled, started)) * 1000
+            })
+
+    def run(self, workload: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """Send the whole workload and return the report"""
+        self.records = []
+        start = time.perf_counter()
+        interval = 1.0 / self.qps if self.qps > 0 else 0.0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for i, (app, text) in enumerate(workload):
+                scheduled = start + i * interval if interval else None
+                executor.submit(self._send, app, text, scheduled)
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """Throughput, latency percentiles and per-app detection stats"""
+        latencies = sorted(r["latency_ms"] for r in self.records if not r["error"])
+        service = sorted(r["service_ms"] for r in self.records if not r["error"])
+        per_app: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            stats = per_app.setdefault(record["app"], {"requests": 0, "detections": 0,
+                                                       "errors": 0, "latencies": []})
+            stats["requests"] += 1
+            stats["detections"] += record["detected"]
+            if record["error"]:
+                stats["errors"] += 1
+            else:
+                stats["latencies"].append(record["latency_ms"])
+
+        apps = {}
+        for app, stats in per_app.items():
+            app_latencies = sorted(stats.pop("latencies"))
+            stats["detection_rate"] = stats["detections"] / stats["requests"]
+            stats["p99_ms"] = percentile(app_latencies, 0.99)
+            apps[app] = stats
+
+        return {
+            "requests": len(self.records),
+            "errors": sum(1 for r in self.records if r["error"]),
+            "elapsed_s": elapsed,
+            "throughput_rps": len(self.records) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "service_p99_ms": percentile(service, 0.99),
+            "apps": apps
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a load test report"""
+    print(f"📊 {report['requests']} requests in {report['elapsed_s']:.2f}s "
+          f"→ {report['throughput_rps']:.1f} req/s, {report['errors']} errors")
+    print(f"⏱️  latency p50 {report['p50_ms']:.2f} ms, p95 {report['p95_ms']:.2f} ms, "
+          f"p99 {report['p99_ms']:.2f} ms (service p99 {report['service_p99_ms']:.2f} ms)")
+    print("\n📈 DETECTION STATS BY APP:")
+    for app, stats in sorted(report["apps"].items()):
+        print(f"  • {app}: {stats['requests']} requests, {stats['detections']} detections "
+              f"({stats['detection_rate']:.0%}), p99 {stats['p99_ms']:.2f} ms")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Replay typing traffic against the detector")
+    parser.add_argument("--mix", choices=["persistent", "aggressive", "enhanced", "all"], default="all")
+    parser.add_argument("--messages", type=int, default=200, help="messages to replay")
+    parser.add_argument("--keystrokes", action="store_true", help="replay every typed prefix")
+    parser.add_argument("--qps", type=float, default=0.0, help="target request rate (0 = unthrottled)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--url", help="detection service URL, e.g. http://127.0.0.1:5000/detect")
+    parser.add_argument("--detector", choices=["full", "lite", "simple"], default="full")
+    parser.add_argument("--deadline-ms", type=float, help="per-message budget (ContentDetector)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.url:
+        target = HttpTarget(args.url)
+    elif args.detector == "simple":
+        from test_detector import SimpleContentDetector
+        target = InProcessTarget(SimpleContentDetector())
+    else:
+        from deepfake_detector import ContentDetector
+        target = InProcessTarget(ContentDetector(profile=args.detector), args.deadline_ms)
+
+    apps, phrases = load_mix(args.mix)
+    workload = build_workload(apps, phrases, args.messages, args.keystrokes, seed=args.seed)
+
+    print("🚦 TYPING TRAFFIC LOAD TEST")
+    print("=" * 60)
+    print(f"{len(apps)} apps, {len(phrases)} phrases, {len(workload)} requests "
+          f"({'keystroke' if args.keystrokes else 'message'} replay), "
+          f"qps={args.qps or 'max'}, concurrency={args.concurrency}")
+    print_report(LoadGenerator(target, qps=args.qps, concurrency=args.concurrency).run(workload))
+    if getattr(target, "deadline_ms", None) is not None:
+        stats = target.detector.get_deadline_stats()
+        print(f"\n⏰ Deadline hit on {stats['hit_rate']:.1%} of messages, "
+              f"skipped: {stats['skipped']}, cut short: {stats['cut_short']}")
+
+
+if __name__ == "__main__":
+    main()
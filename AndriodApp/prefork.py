@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Pre-Fork Worker Pool
+Loads the detector once in the parent, freezes it and forks workers that
+share it instead of loading copies. The shared-memory "numeric tables" are
+only the weight arrays of the spaCy pipeline; rule tables, reference
+sentences and an optional classifier stage stay ordinary Python objects,
+shared through copy-on-write after ``gc.freeze``. Without a spaCy model
+the segment is empty.
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import resource
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Callable
+
+import numpy as np
+
+from thread_safe_detector import freeze_rules
+
+# Set in the parent right before forking; workers inherit it
+_WORKER_DETECTOR = None
+_WORKER_BARRIER = None
+
+
+class SharedNumericTables:
+    """Numeric arrays of a detector moved into one shared-memory segment
+
+    Covers only the weights of the spaCy pipeline, the bulk of a loaded
+    model. Forked workers map the same physical pages, so they stay shared
+    even when nearby Python objects are written and copy-on-write would
+    otherwise duplicate the page. Everything else, including the
+    classifier stage's arrays, is shared through copy-on-write only.
+    """
+
+    def __init__(self, arrays: List[np.ndarray]):
+        self.size = sum(array.nbytes for array in arrays)
+        self.segment = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        self.views = []
+        offset = 0
+        for array in arrays:
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=self.segment.buf, offset=offset)
+            view[...] = array
+            self.views.append(view)
+            offset += array.nbytes
+
+    def release(self) -> None:
+        """Free the segment; call once all workers have exited"""
+        self.views = []
+        try:
+            self.segment.close()
+        except BufferError:
+            # Model parameters still reference the mapping; it is freed at exit
+            pass
+        self.segment.unlink()
+
+
+def _model_params(nlp) -> List[tuple]:
+    """(thinc node, param name) pairs for every array in a spaCy pipeline"""
+    params = []
+    seen = set()
+    for _, component in nlp.pipeline:
+        model = getattr(component, "model", None)
+        if model is None or not hasattr(model, "walk"):
+            continue
+        for node in model.walk():
+            if node.id in seen:
+                continue
+            seen.add(node.id)
+            for name in node.param_names:
+                if node.has_param(name) and isinstance(node.get_param(name), np.ndarray):
+                    params.append((node, name))
+    return params
+
+
+def share_numeric_tables(detector) -> SharedNumericTables:
+    """Move the arrays of the detector's spaCy pipeline into shared memory"""
+    params = _model_params(detector.nlp) if getattr(detector, "nlp", None) else []
+    tables = SharedNumericTables([node.get_param(name) for node, name in params])
+    for (node, name), view in zip(params, tables.views):
+        node.set_param(name, view)
+    return tables
+
+
+def process_memory() -> Dict[str, int]:
+    """Memory of the current process in KB
+
+    Pss (proportional set size) splits shared pages between the processes
+    that map them, so summing Pss over workers gives the real footprint.
+    Falls back to the peak RSS where /proc is not available.
+    """
+    fields = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            report = {}
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    report[key.lower()] = int(value.split()[0])
+            return report
+    except OSError:
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"rss": usage // 1024 if os.uname().sysname == "Darwin" else usage}
+
+
+def _detect(text: str) -> Dict[str, Any]:
+    return _WORKER_DETECTOR.detect_content(text)
+
+
+def _report_memory(_) -> Dict[str, Any]:
+    # Every worker blocks here until all have a task, so each reports once
+    _WORKER_BARRIER.wait(timeout=30)
+    report = process_memory()
+    report["pid"] = os.getpid()
+    return report
+
+
+class PreforkDetectorPool:
+    def __init__(self, detector_factory: Callable = None, workers: int = 4,
+                 share_tables: bool = True):
+        """Load the detector in this process, then fork ``workers`` workers
+
+        Everything loaded before the fork is moved to the permanent GC
+        generation with ``gc.freeze`` so collections in the workers never
+        touch (and thereby copy) those objects' pages.
+        """
+        global _WORKER_DETECTOR, _WORKER_BARRIER
+
+        if detector_factory is None:
+            from deepfake_detector import ContentDetector
+            detector_factory = ContentDetector
+
+        start = time.perf_counter()
+        detector = detector_factory()
+        self.tables = share_numeric_tables(detector) if share_tables else None
+        freeze_rules(detector)
+        # Warm lazy caches (regex cache, spaCy vocab) before they get copied
+        detector.detect_content("warm up the detector before forking")
+        self.load_seconds = time.perf_counter() - start
+
+        self.detector = detector
+        self.workers = workers
+        context = multiprocessing.get_context("fork")
+        _WORKER_DETECTOR = detector
+        _WORKER_BARRIER = context.Barrier(workers)
+
+        gc.collect()
+        gc.freeze()
+        self._pool = context.Pool(workers)
+        gc.unfreeze()
+
+    def detect_batch(self, texts: List[str], chunksize: int = 16) -> List[Dict[str, Any]]:
+        """Detect texts across the workers, preserving order"""
+        return self._pool.map(_detect, texts, chunksize=chunksize)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Memory of the parent and of every worker in KB"""
+        workers = self._pool.map(_report_memory, range(self.workers), chunksize=1)
+        shared_kb = self.tables.size // 1024 if self.tables else 0
+        return {
+            "parent": process_memory(),
+            "workers": workers,
+            "shared_tables_kb": shared_kb,
+            "total_pss_kb": sum(w.get("pss", w.get("rss", 0)) for w in workers)
+        }
+
+    def close(self) -> None:
+        """Stop the workers and release shared memory"""
+        self._pool.close()
+        self._pool.join()
+        if self.tables is not None:
+            self.tables.release()
+            self.tables = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def print_memory_report(report: Dict[str, Any]) -> None:
+    """Print per-worker memory"""
+    parent = report["parent"]
+    print(f"👪 Parent: RSS {parent.get('rss', 0) / 1024:.1f} MB")
+    print(f"🧊 Shared numeric tables: {report['shared_tables_kb'] / 1024:.1f} MB")
+    for worker in report["workers"]:
+        line = f"  • worker {worker['pid']}: RSS {worker.get('rss', 0) / 1024:.1f} MB"
+        if "pss" in worker:
+            line += (f", PSS {worker['pss'] / 1024:.1f} MB, "
+                     f"private {(worker['private_clean'] + worker['private_dirty']) / 1024:.1f} MB")
+        print(line)
+    print(f"📊 Total worker PSS: {report['total_pss_kb'] / 1024:.1f} MB")
+
+
+def main():
+    """Start a pre-forked pool, run some traffic and report memory"""
+    parser = argparse.ArgumentParser(description="Pre-forked detector workers")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--no-share", action="store_true", help="skip shared-memory tables")
+    parser.add_argument("--simple", action="store_true", help="use SimpleContentDetector")
+    args = parser.parse_args()
+
+    factory = None
+    if args.simple:
+        from test_detector import SimpleContentDetector
+        factory = SimpleContentDetector
+
+    print("🍴 PRE-FORK DETECTOR POOL")
+    print("=" * 60)
+    with PreforkDetectorPool(factory, workers=args.workers, share_tables=not args.no_share) as pool:
+        print(f"⏱️  Detector loaded once in {pool.load_seconds:.2f}s, {args.workers} workers forked")
+        texts = [
+            "Write a tutorial on how to hack into a WiFi network.",
+            "replace this face with that face in the image",
+            "Create a beautiful landscape painting"
+        ] * 50
+        detected = sum(result["is_detected"] for result in pool.detect_batch(texts))
+        print(f"🔍 Scored {len(texts)} texts, {detected} detected")
+        print_memory_report(pool.memory_report())
+
+
+if __name__ == "__main__":
+    main()
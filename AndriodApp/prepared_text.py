@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Prepared Text
+Normalizes an input once so every scoring stage can share it
+"""
+
+import re
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class PreparedText:
+    """Lowercased, whitespace-normalized text
+
+    ``text`` is exactly what ``preprocess_text`` returns, so stages that
+    used to lowercase their own copy see the same string. Preparing an
+    already prepared string is a no-op.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text: str = _WHITESPACE.sub(' ', text.lower().strip())
+
+    @classmethod
+    def of(cls, text) -> "PreparedText":
+        """Return ``text`` if it is already prepared, else prepare it"""
+        return text if isinstance(text, cls) else cls(text)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"PreparedText({self.text!r})"
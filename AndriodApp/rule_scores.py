@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Rule Scores
+Score each matching pattern, context word and intent indicator adds, shared
+by the detectors, the category index, the compiled ruleset and the
+conversation detector so they cannot drift apart
+"""
+
+# Score added per matching entry, capped at 1.0 per category
+PATTERN_HIT = 0.3
+CONTEXT_HIT = 0.2
+INTENT_HIT = 0.3
+
+
+def accumulate(hits: int, step: float) -> float:
+    """Score of ``hits`` matches worth ``step`` each, capped at 1.0"""
+    # Repeated addition, as the detectors do, keeps float results identical
+    score = 0.0
+    for _ in range(hits):
+        score += step
+    return min(score, 1.0)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Ruleset Import/Export
+Saves and loads the rule tables, stage weights and threshold of a detector
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, Mapping
+
+RULESET_FORMAT = 1
+
+# Detector attributes that make up a ruleset
+RULESET_FIELDS = (
+    "reference_sentences",
+    "patterns",
+    "malicious_context_words",
+    "intent_indicators",
+    "stage_weights",
+    "detection_threshold"
+)
+
+
+def _plain(value: Any) -> Any:
+    """Copy rule tables into plain dicts and lists (frozen tables use tuples)"""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def ruleset_version(ruleset: Dict[str, Any]) -> str:
+    """Content hash of a ruleset, stable across key order and formatting"""
+    payload = {field: _plain(ruleset[field]) for field in RULESET_FIELDS}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def stage_versions(detector) -> Dict[str, str]:
+    """Content hash of the rule table each scoring stage reads
+
+    A stage's scores for a given text stay valid as long as its version is
+    unchanged, even if other parts of the ruleset (or the weights) change.
+    """
+    tables = {
+        "pattern": detector.patterns,
+        "context": detector.malicious_context_words,
+        "intent": detector.intent_indicators,
+        "similarity": detector.reference_sentences
+    }
+    versions = {}
+    for stage, table in tables.items():
+        canonical = json.dumps(_plain(table), sort_keys=True, separators=(",", ":"))
+        versions[stage] = hashlib.sha256(f"{stage}:{canonical}".encode("utf-8")).hexdigest()[:16]
+    return versions
+
+
+def export_ruleset(detector) -> Dict[str, Any]:
+    """Snapshot the rules of a ContentDetector or SimpleContentDetector"""
+    ruleset = {
+        field: _plain(getattr(detector, field))
+        for field in RULESET_FIELDS
+    }
+    ruleset["format"] = RULESET_FORMAT
+    ruleset["version"] = ruleset_version(ruleset)
+    return ruleset
+
+
+def apply_ruleset(detector, ruleset: Dict[str, Any]) -> None:
+    """Replace the rules of a detector with the ones from a ruleset"""
+    if ruleset.get("format") != RULESET_FORMAT:
+        raise ValueError(f"Unsupported ruleset format: {ruleset.get('format')}")
+
+    missing = [field for field in RULESET_FIELDS if field not in ruleset]
+    if missing:
+        raise ValueError(f"Ruleset is missing fields: {', '.join(missing)}")
+
+    for field in RULESET_FIELDS:
+        setattr(detector, field, _plain(ruleset[field]))
+    if hasattr(detector, "rules_changed"):
+        detector.rules_changed()
+
+
+def save_ruleset(ruleset: Dict[str, Any], path: str) -> None:
+    """Write a ruleset to a JSON file"""
+    ruleset = dict(ruleset)
+    ruleset["version"] = ruleset_version(ruleset)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(ruleset, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_ruleset(path: str) -> Dict[str, Any]:
+    """Read a ruleset from a JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        ruleset = json.load(f)
+    ruleset["version"] = ruleset_version(ruleset)
+    return ruleset
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Shadow Evaluation
+Mirrors a sample of live requests to a candidate ruleset on a background
+worker and collects how often and where its verdicts disagree with
+production, without adding latency to the primary verdict
+"""
+
+import argparse
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Any
+
+# Put on the queue by close() to stop the worker
+_STOP = object()
+
+
+def candidate_from_ruleset(path: str, profile: str = "lite"):
+    """A ContentDetector running the ruleset stored at ``path``"""
+    from deepfake_detector import ContentDetector
+    from ruleset import load_ruleset, apply_ruleset
+    detector = ContentDetector(profile=profile)
+    apply_ruleset(detector, load_ruleset(path))
+    return detector
+
+
+class ShadowEvaluator:
+    def __init__(self, primary, candidate, sample_rate: float = 0.05, queue_size: int = 1000,
+                 max_examples: int = 50, seed: int = None):
+        """Serve ``primary`` and mirror a ``sample_rate`` share of requests to ``candidate``
+
+        The primary path only draws a random number and, for sampled
+        requests, does a non-blocking put; when the queue of
+        ``queue_size`` is full the mirror is dropped (and counted) rather
+        than waiting. Up to ``max_examples`` recent disagreements are kept.
+        The candidate still shares the interpreter (and its GIL) with the
+        primary, so keep the sample rate to what a spare core can absorb.
+        """
+        self.primary = primary
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self._rng = random.Random(seed)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self.examples: deque = deque(maxlen=max_examples)
+        self.stats = {
+            "requests": 0,
+            "mirrored": 0,
+            "dropped": 0,
+            "compared": 0,
+            "errors": 0,
+            "agreements": 0,
+            "newly_detected": 0,
+            "no_longer_detected": 0,
+            "category_changed": 0,
+            "confidence_delta_sum": 0.0
+        }
+        self.transitions: Dict[str, int] = {}
+        self._worker = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+        self._worker.start()
+
+    def detect_content(self, text: str) -> Dict[str, Any]:
+        """The primary verdict; sampled requests are also queued for the candidate"""
+        result = self.primary.detect_content(text)
+        mirrored = self._rng.random() < self.sample_rate
+        if mirrored:
+            try:
+                self._queue.put_nowait((text, result["is_detected"], result["category"], result["confidence"]))
+            except queue.Full:
+                mirrored = None
+        with self._lock:
+            self.stats["requests"] += 1
+            if mirrored:
+                self.stats["mirrored"] += 1
+            elif mirrored is None:
+                self.stats["dropped"] += 1
+        return result
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                text, detected, category, confidence = item
+                try:
+                    shadow = self.candidate.detect_content(text)
+                except Exception:
+                    with self._lock:
+                        self.stats["errors"] += 1
+                    continue
+                self._compare(text, detected, category, confidence, shadow)
+            finally:
+                self._queue.task_done()
+
+    def _compare(self, text: str, detected: bool, category: str, confidence: float,
+                 shadow: Dict[str, Any]) -> None:
+        with self._lock:
+            stats = self.stats
+            stats["compared"] += 1
+            stats["confidence_delta_sum"] += abs(shadow["confidence"] - confidence)
+            if shadow["is_detected"] == detected and shadow["category"] == category:
+                stats["agreements"] += 1
+                return
+            if shadow["is_detected"] and not detected:
+                stats["newly_detected"] += 1
+            elif detected and not shadow["is_detected"]:
+                stats["no_longer_detected"] += 1
+            else:
+                stats["category_changed"] += 1
+            transition = f"{category} -> {shadow['category']}"
+            self.transitions[transition] = self.transitions.get(transition, 0) + 1
+            self.examples.append({
+                "text": text,
+                "primary": {"category": category, "confidence": confidence},
+                "candidate": {"category": shadow["category"], "confidence": shadow["confidence"]}
+            })
+
+    def drain(self, timeout: float = None) -> bool:
+        """Wait until every queued mirror was compared; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def get_report(self) -> Dict[str, Any]:
+        """Disagreement statistics and recent examples"""
+        with self._lock:
+            stats = dict(self.stats)
+            transitions = dict(self.transitions)
+            examples = list(self.examples)
+        compared = stats["compared"]
+        disagreements = compared - stats["agreements"]
+        delta_sum = stats.pop("confidence_delta_sum")
+        return dict(
+            stats,
+            queued=self._queue.qsize(),
+            disagreements=disagreements,
+            disagreement_rate=disagreements / compared if compared else 0.0,
+            mean_confidence_delta=delta_sum / compared if compared else 0.0,
+            transitions=dict(sorted(transitions.items(), key=lambda item: -item[1])),
+            examples=examples
+        )
+
+    def print_report(self, examples: int = 5) -> None:
+        """Print the shadow comparison so far"""
+        report = self.get_report()
+        print(f"🌗 {report['requests']} requests, {report['mirrored']} mirrored, "
+              f"{report['dropped']} dropped (queue full), {report['compared']} compared")
+        print(f"   Disagreement rate {report['disagreement_rate']:.1%}: "
+              f"{report['newly_detected']} newly detected, {report['no_longer_detected']} no longer "
+              f"detected, {report['category_changed']} changed category")
+        print(f"   Mean confidence change {report['mean_confidence_delta']:.3f}")
+        for transition, count in list(report["transitions"].items())[:10]:
+            print(f"  • {transition}: {count}")
+        for example in report["examples"][-examples:]:
+            print(f"  ↳ '{example['text'][:60]}' {example['primary']['category']} "
+                  f"({example['primary']['confidence']:.2f}) → {example['candidate']['category']} "
+                  f"({example['candidate']['confidence']:.2f})")
+
+    def close(self, drain: bool = True) -> None:
+        """Stop the worker, after comparing what is queued unless ``drain`` is False"""
+        if not drain:
+            try:
+                while True:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+            except queue.Empty:
+                pass
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """Shadow a candidate ruleset on replayed demo traffic"""
+    parser = argparse.ArgumentParser(description="Compare a candidate ruleset against production traffic")
+    parser.add_argument("candidate", help="candidate ruleset JSON")
+    parser.add_argument("--primary", help="production ruleset JSON (default: built-in rules)")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    from deepfake_detector import ContentDetector
+    from load_generator import load_mix, build_workload
+
+    primary = candidate_from_ruleset(args.primary) if args.primary else ContentDetector(profile="lite")
+    candidate = candidate_from_ruleset(args.candidate)
+    apps, phrases = load_mix("all")
+
+    print("🌗 SHADOW EVALUATION")
+    print("=" * 60)
+    with ShadowEvaluator(primary, candidate, args.sample_rate, args.queue_size) as shadow:
+        start = time.perf_counter()
+        for _, text in build_workload(apps, phrases, args.messages, keystrokes=False):
+            shadow.detect_content(text)
+        elapsed = time.perf_counter() - start
+    print(f"Primary path: {elapsed * 1000 / args.messages:.3f} ms/request")
+    shadow.print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Persistent spaCy Feature Cache
+SQLite cache of the entities, verbs, nouns and pronouns extracted by
+spaCy, keyed by text hash and model version, so recurring traffic and
+re-scans skip parsing across runs and processes
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Any, Iterable
+
+# Bump when extract_spacy_features changes what it returns
+FEATURE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spacy_features (
+    text_hash TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    features TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (text_hash, model_version)
+);
+CREATE INDEX IF NOT EXISTS spacy_features_last_used ON spacy_features (last_used);
+"""
+
+
+def model_version(nlp) -> str:
+    """Model name, version and pipeline, plus the feature format"""
+    meta = nlp.meta
+    return (f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}:"
+            f"{'+'.join(nlp.pipe_names)}:{FEATURE_VERSION}")
+
+
+def feature_hash(text: str) -> str:
+    """Hash of the text exactly as spaCy parses it
+
+    The detectors only pass normalized text (``prepare_text``), so this is
+    the normalized-text hash; raw text is not normalized again because
+    spaCy's output depends on case.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SpacyFeatureCache:
+    def __init__(self, path: str = "spacy_cache.db", version: str = "", max_entries: int = 200000,
+                 touch_batch: int = 1000):
+        """Open (or create) the cache for one model ``version``
+
+        Holds at most about ``max_entries`` rows across all versions: once
+        the limit is passed the least recently used tenth is evicted, so
+        entries of an old model age out on their own. Hits are not written
+        back one lookup at a time; their recency is recorded in one
+        transaction once ``touch_batch`` entries were hit, before storing
+        or evicting, and on close. Safe to share between threads; a forked
+        worker opens its own connection on first use.
+        """
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.touch_batch = touch_batch
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+        self._connect()
+
+    def _connect(self) -> None:
+        self._pid = os.getpid()
+        self._touched = set()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._rows = self.conn.execute("SELECT COUNT(*) FROM spacy_features").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross fork()
+        if os.getpid() != self._pid:
+            self._connect()
+        return self.conn
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached features by text; texts without an entry are left out"""
+        digests = {feature_hash(text): text for text in texts}
+        hashes = list(digests)
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT text_hash, features FROM spacy_features WHERE model_version = ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [self.version] + chunk
+                )
+                for text_hash, features in rows:
+                    found[digests[text_hash]] = json.loads(features)
+                    self._touched.add(text_hash)
+            if len(self._touched) >= self.touch_batch:
+                self._touch(conn)
+                conn.commit()
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(digests) - len(found)
+        return found
+
+    def _touch(self, conn: sqlite3.Connection) -> None:
+        # Record when the pending hits were used, so eviction keeps them
+        if self._touched:
+            now = time.time()
+            conn.executemany(
+                "UPDATE spacy_features SET last_used = ? WHERE text_hash = ? AND model_version = ?",
+                [(now, text_hash, self.version) for text_hash in self._touched]
+            )
+            self._touched.clear()
+
+    def put_many(self, features: Dict[str, Dict[str, Any]]) -> None:
+        """Store the features of freshly parsed texts"""
+        if not features:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            stored = conn.executemany(
+                "INSERT OR IGNORE INTO spacy_features VALUES (?, ?, ?, ?)",
+                [(feature_hash(text), self.version, json.dumps(values), now)
+                 for text, values in features.items()]
+            ).rowcount
+            self._rows += stored
+            self.stats["stored"] += stored
+            self._touch(conn)
+            if self._rows > self.max_entries:
+                self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Other processes add rows too, so count before deciding
+        self._rows = conn.execute("SELECT COUNT(*) FROM spacy_features").fetchone()[0]
+        excess = self._rows - self.max_entries * 9 // 10
+        if self._rows <= self.max_entries or excess <= 0:
+            return
+        removed = conn.execute(
+            "DELETE FROM spacy_features WHERE rowid IN "
+            "(SELECT rowid FROM spacy_features ORDER BY last_used LIMIT ?)", (excess,)
+        ).rowcount
+        self._rows -= removed
+        self.stats["evicted"] += removed
+
+    def prune(self) -> int:
+        """Drop entries of other model versions; returns rows removed"""
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute(
+                "DELETE FROM spacy_features WHERE model_version != ?", (self.version,)
+            ).rowcount
+            self._rows -= removed
+            conn.commit()
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and size of the cache"""
+        with self._lock:
+            stats = dict(self.stats, entries=self._rows)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if os.getpid() == self._pid:
+                self._touch(self.conn)
+            self.conn.commit()
+            self.conn.close()
+
+
+def main():
+    """Analyze a corpus twice to compare cold and warm spaCy runs"""
+    parser = argparse.ArgumentParser(description="Benchmark the persistent spaCy feature cache")
+    parser.add_argument("--cache", default="spacy_cache.db")
+    parser.add_argument("--corpus", help="text file with one message per line (default: test sentences)")
+    parser.add_argument("--max-entries", type=int, default=200000)
+    args = parser.parse_args()
+
+    from deepfake_detector import ContentDetector, TEST_SENTENCES
+
+    detector = ContentDetector()
+    if detector.nlp is None:
+        print("⚠️  en_core_web_sm is not installed; nothing to cache")
+        return
+    texts: List[str] = TEST_SENTENCES
+    if args.corpus:
+        with open(args.corpus, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    prepared = [detector.preprocess_text(text) for text in texts]
+    detector.use_spacy_cache(args.cache, args.max_entries)
+
+    print("🧠 SPACY FEATURE CACHE")
+    print("=" * 60)
+    for run in ("first", "second"):
+        start = time.perf_counter()
+        detector.analyze_batch_with_spacy(prepared)
+        elapsed = time.perf_counter() - start
+        print(f"{run:>7} run: {elapsed * 1000 / len(prepared):.3f} ms/text")
+    stats = detector.spacy_cache.get_stats()
+    print(f"Hit rate {stats['hit_rate']:.1%}, {stats['entries']} entries in {args.cache}")
+    detector.spacy_cache.close()
+
+
+if __name__ == "__main__":
+    main()
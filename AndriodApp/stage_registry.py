@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Stage Registry
+Pluggable scoring stages that declare their cost and dependencies, so the
+independent ones (spaCy next to the regex, keyword and similarity stages)
+can run concurrently within a single request
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Tuple
+
+from prepared_text import PreparedText
+
+# Rough per-message cost used to order stages when nothing was measured yet
+DEFAULT_STAGE_COST_MS = {
+    "intent": 0.01,
+    "context": 0.02,
+    "pattern": 0.1,
+    "classifier": 0.3,
+    "similarity": 1.5,
+    "spacy": 10.0
+}
+
+# Stages combined into the verdict by ContentDetector.combine_scores
+SCORE_STAGES = ("pattern", "context", "intent", "similarity", "classifier")
+
+
+class Stage:
+    """One scoring stage: ``run(prepared_text, results)`` returns its output
+
+    ``results`` holds the outputs of the stages listed in ``depends``.
+    """
+
+    __slots__ = ("name", "run", "cost_ms", "depends")
+
+    def __init__(self, name: str, run: Callable[[PreparedText, Dict[str, Any]], Any],
+                 cost_ms: float, depends: Tuple[str, ...]):
+        self.name = name
+        self.run = run
+        self.cost_ms = cost_ms
+        self.depends = depends
+
+
+class StageRegistry:
+    def __init__(self):
+        self._stages: Dict[str, Stage] = {}
+        self._waves = None
+
+    def register(self, name: str, run: Callable, cost_ms: float = None,
+                 depends: Tuple[str, ...] = ()) -> None:
+        """Add a stage; its dependencies must already be registered"""
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already registered")
+        missing = [dependency for dependency in depends if dependency not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {', '.join(missing)}")
+        cost = DEFAULT_STAGE_COST_MS.get(name, 1.0) if cost_ms is None else cost_ms
+        self._stages[name] = Stage(name, run, cost, tuple(depends))
+        self._waves = None
+
+    def unregister(self, name: str) -> None:
+        """Remove a stage that no other stage depends on"""
+        dependents = [stage.name for stage in self._stages.values() if name in stage.depends]
+        if dependents:
+            raise ValueError(f"Stages depend on '{name}': {', '.join(dependents)}")
+        del self._stages[name]
+        self._waves = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    def waves(self) -> List[List[Stage]]:
+        """Stages grouped so each group only needs earlier groups, most expensive first"""
+        if self._waves is None:
+            level: Dict[str, int] = {}
+            for stage in self._stages.values():
+                # Dependencies are registered first, so their level is known
+                level[stage.name] = 1 + max((level[d] for d in stage.depends), default=-1)
+            waves = [[] for _ in range(max(level.values(), default=-1) + 1)]
+            for stage in self._stages.values():
+                waves[level[stage.name]].append(stage)
+            for wave in waves:
+                wave.sort(key=lambda stage: stage.cost_ms, reverse=True)
+            self._waves = waves
+        return self._waves
+
+
+def default_registry(detector) -> StageRegistry:
+    """The stages of ``detector.detect_content`` as a registry
+
+    Costs come from the detector's measured stage costs when it has them.
+    """
+    measured = getattr(detector, "stage_cost_ms", {})
+    registry = StageRegistry()
+
+    def cost(name: str) -> float:
+        return measured.get(name) or DEFAULT_STAGE_COST_MS[name]
+
+    registry.register("pattern", lambda text, _: detector.check_pattern_matching(text), cost("pattern"))
+    registry.register("context", lambda text, _: detector.check_context_words(text), cost("context"))
+    registry.register("intent", lambda text, _: detector.check_intent_indicators(text), cost("intent"))
+    registry.register("similarity", lambda text, _: detector.check_reference_similarity(text),
+                      cost("similarity"))
+    if getattr(detector, "classifier", None) is not None:
+        registry.register("classifier", lambda text, _: detector.classifier.score(text), cost("classifier"))
+    if getattr(detector, "nlp", None):
+        registry.register("spacy", lambda text, _: detector.analyze_with_spacy(text.text), cost("spacy"))
+    return registry
+
+
+class StagedDetector:
+    """Runs a detector's stages concurrently within each request
+
+    Within a wave of independent stages the expensive ones go to the
+    executor and the calling thread runs the cheap ones, then takes back
+    any offloaded stage that has not started yet. Stages that do not
+    release the GIL gain nothing from the overlap; spaCy's compiled model
+    code does, so a request costs about its slowest stage instead of the
+    sum. Verdicts equal ``detector.detect_content``; results do too
+    unless the detector's category index is enabled, in which case
+    ``detect_content`` reports 0.0 similarity for categories without
+    pattern or context hits while the similarity stage here, running
+    alongside those stages, scores every category.
+    """
+
+    def __init__(self, detector=None, registry: StageRegistry = None, executor=None,
+                 max_workers: int = None, inline_below_ms: float = 0.5):
+        """Use ``executor`` (e.g. one shared by the service) or start a private one"""
+        if detector is None:
+            from deepfake_detector import ContentDetector
+            detector = ContentDetector()
+        self.detector = detector
+        self.registry = registry or default_registry(detector)
+        self.inline_below_ms = inline_below_ms
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers or min(4, os.cpu_count() or 1), thread_name_prefix="stage"
+        )
+
+    def run_stages(self, text) -> Dict[str, Any]:
+        """Outputs of every registered stage, by name"""
+        prepared = self.detector.prepare_text(text)
+        results: Dict[str, Any] = {}
+        for wave in self.registry.waves():
+            offloaded = [(stage, self._executor.submit(stage.run, prepared, results))
+                         for stage in wave[:-1] if stage.cost_ms >= self.inline_below_ms]
+            submitted = {stage.name for stage, _ in offloaded}
+            for stage in reversed(wave):
+                if stage.name not in submitted:
+                    results[stage.name] = stage.run(prepared, results)
+            # Cheapest first; a stage no worker picked up yet runs here
+            for stage, future in reversed(offloaded):
+                if future.cancel():
+                    results[stage.name] = stage.run(prepared, results)
+                else:
+                    results[stage.name] = future.result()
+        return results
+
+    def detect_content(self, text: str) -> Dict[str, Any]:
+        """Same verdict as ``detector.detect_content(text)``"""
+        results = self.run_stages(text)
+        result = self.detector.combine_scores(results.get("pattern", {}), results.get("context", {}),
+                                              results.get("intent", 0.0), results.get("similarity", {}),
+                                              results.get("classifier"))
+        result["details"]["spacy_analysis"] = results.get("spacy", {})
+        extra = {name: output for name, output in results.items()
+                 if name not in SCORE_STAGES and name != "spacy"}
+        if extra:
+            result["details"]["stage_results"] = extra
+        return result
+
+    def close(self) -> None:
+        """Shut down the private executor (a shared one is left running)"""
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """Compare serial and concurrent stage execution per request"""
+    from deepfake_detector import ContentDetector, TEST_SENTENCES
+
+    detector = ContentDetector()
+    if detector.nlp is None:
+        print("⚠️  en_core_web_sm is not installed; spaCy is the stage that overlaps best")
+    with StagedDetector(detector) as staged:
+        for name, run in (("serial", detector.detect_content), ("concurrent", staged.detect_content)):
+            run(TEST_SENTENCES[0])
+            start = time.perf_counter()
+            for _ in range(20):
+                for text in TEST_SENTENCES:
+                    run(text)
+            latency = (time.perf_counter() - start) * 1000 / (20 * len(TEST_SENTENCES))
+            print(f"{name:>10}: {latency:.3f} ms/request")
+        same = all(staged.detect_content(text) == detector.detect_content(text) for text in TEST_SENTENCES)
+        print(f"Results identical to serial execution: {same}")
+
+
+if __name__ == "__main__":
+    main()
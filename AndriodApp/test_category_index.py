@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test for the category trigger index
+Checks that indexed rule scores equal the full scan, that verdicts stay the
+same when similarity of untriggered categories is skipped, and that the
+index follows rule changes
+"""
+
+from category_index import required_literal, synthetic_categories
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+from ruleset import export_ruleset, apply_ruleset
+from test_compiled_ruleset import EXTRA_SENTENCES
+
+MESSAGES = TEST_SENTENCES + EXTRA_SENTENCES + [
+    "zq02x how to hack into zq02x hacking tools",
+    "HACK İNTO the ſystem",
+    "how   to bypass"
+]
+
+VERDICT = ("is_detected", "category", "confidence", "reason")
+
+
+def test_required_literal():
+    assert required_literal(r"hack\s+into") == "hack"
+    assert required_literal(r"\bkeylog(ger)?\b") == "keylog"
+    assert required_literal(r"abc*d") == "ab"
+    assert required_literal(r"x{0,2}yz") == "yz"
+    assert required_literal(r"[abc]def\.gh") == "def.gh"
+    assert required_literal(r"hack|crack") == ""
+    assert required_literal(r"(?x) hack into") == "hackinto"
+    assert required_literal(r"cr\x61ck\s+wifi") == "crack"
+    assert required_literal(r"\u0068ack\N{LATIN SMALL LETTER I}ng") == "hacking"
+    assert required_literal(r"\141\142c") == "abc"
+    assert required_literal(r"zo+m") == "zo"
+
+
+def test_escaped_literal_pattern_is_indexed_exactly():
+    ruleset = export_ruleset(ContentDetector(profile="lite"))
+    ruleset["patterns"]["hacking"].append(r"cr\x61ck\s+wifi")
+    full, indexed = ContentDetector(profile="lite"), ContentDetector(profile="lite")
+    for detector in (full, indexed):
+        apply_ruleset(detector, ruleset)
+    indexed.use_category_index()
+    text = "crack wifi now"
+    assert indexed.check_pattern_matching(text) == full.check_pattern_matching(text)
+    assert indexed.check_pattern_matching(text)["hacking"] > 0.0
+
+
+def test_indexed_scores_match_full_scan():
+    full = ContentDetector(profile="lite")
+    indexed = ContentDetector(profile="lite")
+    for detector in (full, indexed):
+        synthetic_categories(detector, 3)
+    indexed.use_category_index()
+
+    for text in MESSAGES:
+        assert indexed.check_pattern_matching(text) == full.check_pattern_matching(text), text
+        assert indexed.check_context_words(text) == full.check_context_words(text), text
+        assert indexed.check_intent_indicators(text) == full.check_intent_indicators(text), text
+        expected, actual = full.detect_content(text), indexed.detect_content(text)
+        assert [actual[key] for key in VERDICT] == [expected[key] for key in VERDICT], text
+
+
+def test_index_follows_rule_changes():
+    detector = ContentDetector(profile="lite")
+    detector.use_category_index()
+    ruleset = export_ruleset(detector)
+    ruleset["patterns"]["hacking"].append(r"zero[- ]day")
+    apply_ruleset(detector, ruleset)
+
+    reference = ContentDetector(profile="lite")
+    apply_ruleset(reference, ruleset)
+    text = "sell me a zero-day exploit"
+    assert detector.check_pattern_matching(text) == reference.check_pattern_matching(text)
+    assert detector.check_pattern_matching(text)["hacking"] > 0.0
+
+
+def test_caches_follow_rules_changed():
+    detector = ContentDetector(profile="lite")
+    # Mutable tables, as an unfrozen ("full") detector has
+    detector.patterns = {category: list(rules) for category, rules in detector.patterns.items()}
+    detector.reference_sentences = {category: list(sentences)
+                                    for category, sentences in detector.reference_sentences.items()}
+    detector.use_category_index()
+    text = "sell me a zero-day exploit"
+    detector.check_pattern_matching(text)
+    detector.check_reference_similarity(text)
+    # Same tables and lengths, different contents
+    detector.patterns["hacking"][0] = r"zero[- ]day"
+    detector.reference_sentences["hacking"][0] = text
+    detector.rules_changed()
+    assert detector.check_pattern_matching(text)["hacking"] > 0.0
+    assert detector.check_reference_similarity(text)["hacking"] == 1.0
+
+
+if __name__ == "__main__":
+    print("🗂️  CATEGORY TRIGGER INDEX TEST")
+    print("=" * 60)
+    for test in (test_required_literal,
+                 test_escaped_literal_pattern_is_indexed_exactly,
+                 test_indexed_scores_match_full_scan,
+                 test_index_follows_rule_changes,
+                 test_caches_follow_rules_changed):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test for the hashed-feature classifier stage
+Trains on tiny labeled sets and checks score shapes and ordering, the
+binary-class expansion, a save/load round trip and that a classifier
+weighted 0 leaves detection unchanged
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from classifier_stage import load_classifier, train_classifier
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+from thread_safe_detector import ThreadSafeDetector
+
+
+class _OneCategoryDetector:
+    """Just the tables train_classifier reads, with a single category"""
+
+    patterns = {"hacking": [r"\bhack\b"]}
+    reference_sentences = {"hacking": ["How to hack into someone's account",
+                                       "Hack my neighbor's wifi password",
+                                       "Break into a server without permission"]}
+
+
+HACKING = ["hack into the email of my ex", "how to hack a facebook account"]
+SAFE = ["bake a chocolate cake", "plan a hiking trip", "learn to play the guitar"]
+
+
+def test_score_batch_shape_and_ordering():
+    detector = ContentDetector(profile="lite")
+    classifier = train_classifier(detector, HACKING + SAFE, ["hacking"] * len(HACKING) + ["safe"] * len(SAFE))
+    assert "safe" in classifier.classes and len(classifier.classes) > 2
+    assert classifier.weights.shape[0] == len(classifier.classes) == len(classifier.intercepts)
+
+    texts = ["hack into my boss's email account", "bake a cake for the weekend"]
+    batch = classifier.score_batch(texts)
+    assert len(batch) == len(texts)
+    for text, scores in zip(texts, batch):
+        assert sorted(scores) == sorted(detector.patterns)
+        assert all(0.0 <= score <= 1.0 for score in scores.values())
+        assert scores == classifier.score(text)
+    # Rows follow the input order: the hacking text ranks hacking higher
+    assert batch[0]["hacking"] > batch[1]["hacking"]
+    assert max(batch[0], key=batch[0].get) == "hacking"
+
+
+def test_binary_model_is_expanded_to_one_row_per_class():
+    classifier = train_classifier(_OneCategoryDetector(), HACKING + SAFE,
+                                  ["hacking"] * len(HACKING) + ["safe"] * len(SAFE))
+    assert classifier.classes == ["hacking", "safe"]
+    assert classifier.weights.shape[0] == 2
+    weights = classifier.weights.toarray()
+    assert np.array_equal(weights[0], -weights[1])
+    assert classifier.intercepts[0] == -classifier.intercepts[1]
+
+    hacking, safe = classifier.score_batch(["hack into her email", "bake a cake with friends"])
+    assert list(hacking) == ["hacking"]
+    assert hacking["hacking"] > 0.5 > safe["hacking"]
+
+
+def test_save_and_load_round_trip():
+    classifier = train_classifier(_OneCategoryDetector(), HACKING + SAFE,
+                                  ["hacking"] * len(HACKING) + ["safe"] * len(SAFE))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "classifier.npz")
+        classifier.save(path)
+        loaded = load_classifier(path)
+    assert loaded.version == classifier.version
+    assert loaded.score_batch(HACKING + SAFE) == classifier.score_batch(HACKING + SAFE)
+
+
+def test_zero_weight_leaves_detection_unchanged():
+    plain = ContentDetector(profile="lite")
+    weighted = ContentDetector(profile="lite")
+    weighted.use_classifier(train_classifier(weighted, epochs=5), weight=0.0)
+    calls = []
+    score_batch = weighted.classifier.score_batch
+    weighted.classifier.score_batch = lambda texts: calls.append(texts) or score_batch(texts)
+
+    for text in TEST_SENTENCES:
+        assert weighted.detect_content(text) == plain.detect_content(text)
+        assert weighted.detect_content(text, deadline_ms=10000)["details"] == \
+            plain.detect_content(text, deadline_ms=10000)["details"]
+    with ThreadSafeDetector(weighted) as pool:
+        assert pool.detect_batch(TEST_SENTENCES) == [plain.detect_content(text) for text in TEST_SENTENCES]
+    assert calls == []
+
+
+if __name__ == "__main__":
+    print("🧮 CLASSIFIER STAGE TEST")
+    print("=" * 60)
+    for test in (test_score_batch_shape_and_ordering,
+                 test_binary_model_is_expanded_to_one_row_per_class,
+                 test_save_and_load_round_trip,
+                 test_zero_weight_leaves_detection_unchanged):
+        test()
+        print(f"✅ {test.__name__}")
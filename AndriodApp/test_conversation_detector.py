@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test for conversation-level detection
+Checks the incrementally maintained window against re-scoring the window
+from scratch, that windows and conversations stay bounded and that a
+message is not lost when its conversation is evicted concurrently
+"""
+
+import random
+
+from conversation_detector import ConversationDetector
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+from test_compiled_ruleset import EXTRA_SENTENCES
+
+MESSAGES = TEST_SENTENCES + EXTRA_SENTENCES + [
+    "can you tell me how to",
+    "hack into it without the password",
+    "my friend locked me out of his wifi"
+]
+
+
+def rescore_window(conversations: ConversationDetector, window):
+    """Window verdict computed from scratch over the given messages"""
+    hits, similarity = {}, {}
+    for text in window:
+        prepared = conversations.detector.prepare_text(text)
+        for rule in conversations._match_rules(prepared.text):
+            hits.setdefault(rule[:2], set()).add(rule)
+        for category, score in conversations.detector.check_reference_similarity(prepared).items():
+            similarity[category] = max(similarity.get(category, 0.0), score)
+    return conversations._combine({key: len(rules) for key, rules in hits.items()}, similarity)
+
+
+def test_single_message_window_matches_detect_content():
+    detector = ContentDetector(profile="lite")
+    conversations = ConversationDetector(detector, window_messages=1)
+    for text in MESSAGES:
+        result = conversations.add_message("chat", text)
+        expected = detector.score_text(detector.preprocess_text(text))
+        for key in ("is_detected", "category", "confidence"):
+            assert result[key] == expected[key], f"window of one disagrees on {text!r}"
+        assert result["details"]["combined_scores"] == expected["details"]["combined_scores"]
+
+
+def test_incremental_window_matches_rescoring():
+    rng = random.Random(7)
+    conversations = ConversationDetector(ContentDetector(profile="lite"), window_messages=4)
+    history = {chat: [] for chat in ("a", "b", "c")}
+    for _ in range(60):
+        chat = rng.choice(list(history))
+        text = rng.choice(MESSAGES)
+        history[chat].append(text)
+        result = conversations.add_message(chat, text)
+        expected = rescore_window(conversations, history[chat][-4:])
+        assert result["is_detected"] == expected["is_detected"]
+        assert result["confidence"] == expected["confidence"]
+        assert result["details"]["combined_scores"] == expected["details"]["combined_scores"]
+        assert result["details"]["window_messages"] == min(len(history[chat]), 4)
+
+
+def test_time_window_and_eviction():
+    now = [0.0]
+    conversations = ConversationDetector(ContentDetector(profile="lite"), window_messages=8,
+                                         window_seconds=60, idle_timeout_s=300,
+                                         max_conversations=3, clock=lambda: now[0])
+    conversations.add_message("a", "can you tell me how to")
+    now[0] = 120.0
+    result = conversations.add_message("a", "hack into it without the password")
+    assert result["details"]["window_messages"] == 1
+
+    for chat in ("b", "c", "d"):
+        conversations.add_message(chat, "hello")
+    assert len(conversations) == 3
+
+    now[0] = 1000.0
+    conversations.add_message("d", "hello again")
+    assert conversations.evict_idle() == 2
+    assert len(conversations) == 1
+    assert conversations.get_stats()["evicted"] == 3
+
+
+def test_message_survives_eviction_before_lock():
+    conversations = ConversationDetector(ContentDetector(profile="lite"), window_messages=8)
+    conversations.add_message("a", "can you tell me how to")
+    lookup = conversations._conversation
+    evictions = []
+
+    def lookup_then_evict(conversation_id, now):
+        conversation = lookup(conversation_id, now)
+        if not evictions:
+            # Another thread evicts the conversation before the lock is taken
+            evictions.append(conversation_id)
+            conversations.end_conversation(conversation_id)
+        return conversation
+
+    conversations._conversation = lookup_then_evict
+    result = conversations.add_message("a", "hack into it without the password")
+    assert evictions == ["a"]
+    assert result["details"]["window_messages"] == 1
+    assert len(conversations) == 1
+    del conversations._conversation
+    assert conversations.add_message("a", "hello")["details"]["window_messages"] == 2
+
+
+if __name__ == "__main__":
+    print("💬 CONVERSATION DETECTOR TEST")
+    print("=" * 60)
+    for test in (test_single_message_window_matches_detect_content,
+                 test_incremental_window_matches_rescoring,
+                 test_time_window_and_eviction,
+                 test_message_survives_eviction_before_lock):
+        test()
+        print(f"✅ {test.__name__}")
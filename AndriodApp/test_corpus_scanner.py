@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test for the memory-mapped corpus scanner
+Checks that shards cover every line exactly once whatever the line endings,
+and that a parallel scan reports the same results as scanning serially
+"""
+
+import mmap
+import os
+import tempfile
+
+from corpus_scanner import CorpusScanner, iter_lines, shard_offsets
+from test_detector import SimpleContentDetector
+from deepfake_detector import TEST_SENTENCES
+
+CORPORA = {
+    "lf": b"hack into wifi\nhello\n\nsteal passwords\n",
+    "crlf": b"hack into wifi\r\nhello\r\n\r\nsteal passwords\r\n",
+    "no_trailing_newline": b"hack into wifi\nhello\nsteal passwords",
+    "blank_lines_only": b"\n\r\n  \n",
+    "single_line": b"one message without newline",
+    "empty": b""
+}
+
+
+def expected_lines(data: bytes):
+    """(offset, line) of every non-blank line, found the naive way"""
+    lines, offset = [], 0
+    for raw in data.split(b"\n"):
+        line = raw.rstrip(b"\r")
+        if line.strip():
+            lines.append((offset, line))
+        offset += len(raw) + 1
+    return lines
+
+
+def sharded_lines(path: str, shards: int):
+    ranges = shard_offsets(path, shards)
+    size = os.path.getsize(path)
+    if not size:
+        assert ranges == []
+        return []
+    # Contiguous ranges covering the whole file
+    assert ranges[0][0] == 0 and ranges[-1][1] == size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return [item for start, end in ranges for item in iter_lines(mapped, start, end)]
+
+
+def test_shards_see_every_line_once():
+    with tempfile.TemporaryDirectory() as directory:
+        for name, data in CORPORA.items():
+            path = os.path.join(directory, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            for shards in range(1, 12):
+                assert sharded_lines(path, shards) == expected_lines(data), (name, shards)
+
+
+def test_parallel_scan_matches_serial():
+    detector = SimpleContentDetector()
+    lines = [TEST_SENTENCES[i % len(TEST_SENTENCES)] for i in range(60)]
+    data = "\r\n".join(lines).encode("utf-8")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dump.txt")
+        with open(path, "wb") as f:
+            f.write(data)
+        expected = []
+        for offset, line in expected_lines(data):
+            result = detector.detect_content(line.decode("utf-8"))
+            expected.append((offset, result["is_detected"], result["category"], result["confidence"]))
+
+        with CorpusScanner(SimpleContentDetector, workers=2) as scanner:
+            assert list(scanner.scan(path, shards=7)) == expected
+            assert list(scanner.scan(path, shards=7, detected_only=True)) == [
+                row for row in expected if row[1]]
+            chunks = list(scanner.scan_columns(path, shards=7))
+        assert [int(offset) for chunk in chunks for offset in chunk["offset"]] == [
+            row[0] for row in expected]
+        # Part files are removed as they are read
+        assert not [name for name in os.listdir(tempfile.gettempdir()) if name.startswith("corpus-scan-")]
+
+
+if __name__ == "__main__":
+    print("📚 CORPUS SCANNER TEST")
+    print("=" * 60)
+    for test in (test_shards_see_every_line_once,
+                 test_parallel_scan_matches_serial):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test for deadline-aware detection
+Checks that an exhausted budget skips stages and flags the partial result,
+that a generous budget gives the full verdict, and that the deadline
+counters stay consistent under concurrent callers
+"""
+
+import threading
+
+from deepfake_detector import ContentDetector, STAGE_ORDER, TEST_SENTENCES
+
+VERDICT = ("is_detected", "category", "confidence", "reason")
+
+
+def test_spent_deadline_skips_stages():
+    detector = ContentDetector(profile="lite")
+    result = detector.detect_content(TEST_SENTENCES[0], deadline_ms=0)
+    details = result["details"]
+    assert details["deadline_exceeded"]
+    assert details["skipped_stages"] == [stage for stage in STAGE_ORDER
+                                         if stage not in ("classifier", "spacy")]
+    assert not result["is_detected"] and details["pattern_scores"] == {}
+    stats = detector.get_deadline_stats()
+    assert stats["requests"] == 1 and stats["deadline_hits"] == 1
+    assert stats["skipped"]["similarity"] == 1
+
+
+def test_generous_deadline_gives_full_verdict():
+    detector = ContentDetector(profile="lite")
+    for text in TEST_SENTENCES:
+        expected = detector.detect_content(text)
+        result = detector.detect_content(text, deadline_ms=10000)
+        assert not result["details"]["deadline_exceeded"]
+        assert [result[key] for key in VERDICT] == [expected[key] for key in VERDICT]
+    assert detector.get_deadline_stats()["deadline_hits"] == 0
+
+
+def test_concurrent_deadline_stats():
+    detector = ContentDetector(profile="lite")
+    threads, rounds = 8, 20
+
+    def worker():
+        for i in range(rounds):
+            detector.detect_content(TEST_SENTENCES[i % len(TEST_SENTENCES)],
+                                    deadline_ms=0 if i % 2 else 10000)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    stats = detector.get_deadline_stats()
+    assert stats["requests"] == threads * rounds
+    assert stats["deadline_hits"] >= threads * rounds // 2
+    assert all(cost >= 0.0 for cost in detector.stage_cost_ms.values())
+
+
+if __name__ == "__main__":
+    print("⏱️  DEADLINE TEST")
+    print("=" * 60)
+    for test in (test_spent_deadline_skips_stages,
+                 test_generous_deadline_gives_full_verdict,
+                 test_concurrent_deadline_stats):
+        test()
+        print(f"✅ {test.__name__}")
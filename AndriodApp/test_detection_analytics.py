@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test for the detection traffic analytics
+Checks the Misra-Gries error bound for single and merged sketches and that
+results are counted from their own pattern scores
+"""
+
+import random
+from collections import Counter
+
+from detection_analytics import DetectionAnalytics, HeavyHitters
+
+
+def skewed_stream(seed: int, length: int = 5000, keys: int = 200):
+    """Keys drawn with Zipf-like frequencies, some added with a weight"""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(keys)]
+    for key in rng.choices(range(keys), weights=weights, k=length):
+        yield key, rng.choice((1, 1, 1, 3))
+
+
+def assert_within_bound(sketch: HeavyHitters, truth: Counter) -> None:
+    error = sketch.total / (sketch.capacity + 1)
+    assert sketch.total == sum(truth.values())
+    assert len(sketch.counters) <= sketch.capacity
+    for key, count in truth.items():
+        estimate = sketch.get(key)
+        assert count - error <= estimate <= count, (key, count, estimate, error)
+
+
+def test_add_stays_within_error_bound():
+    for seed in range(5):
+        sketch = HeavyHitters(capacity=16)
+        truth = Counter()
+        for key, count in skewed_stream(seed):
+            sketch.add(key, count)
+            truth[key] += count
+        assert_within_bound(sketch, truth)
+        # The most frequent key clears the bound and must be kept
+        assert truth.most_common(1)[0][0] in sketch.counters
+
+
+def test_merge_stays_within_combined_error_bound():
+    for seed in range(5):
+        left, right = HeavyHitters(capacity=16), HeavyHitters(capacity=16)
+        truth = Counter()
+        for index, (key, count) in enumerate(skewed_stream(seed)):
+            (left if index % 3 else right).add(key, count)
+            truth[key] += count
+        left.merge(right)
+        assert_within_bound(left, truth)
+
+
+def test_merge_below_capacity_is_exact():
+    left, right = HeavyHitters(capacity=8), HeavyHitters(capacity=8)
+    for key in "aab":
+        left.add(key)
+    for key in "abc":
+        right.add(key)
+    left.merge(right)
+    assert left.top() == [("a", 3), ("b", 2), ("c", 1)]
+    assert left.total == 6
+
+
+def test_record_result_counts_scored_pattern_categories():
+    analytics = DetectionAnalytics(window_seconds=60, buckets=6, top_k=8)
+    detected = {"is_detected": True, "category": "hacking",
+                "details": {"pattern_scores": {"hacking": 0.6, "fraud": 0.3, "deepfake": 0.0}}}
+    safe = {"is_detected": False, "category": "safe",
+            "details": {"pattern_scores": {"hacking": 0.3, "fraud": 0.0, "deepfake": 0.0}}}
+    analytics.record_result("chat", "hack into the server", detected, now=10.0)
+    analytics.record_result("chat", "hack the weekend", safe, now=11.0)
+
+    snapshot = analytics.snapshot(now=12.0)
+    assert snapshot["window"]["events"] == 2
+    assert snapshot["window"]["detections"] == 1
+    assert sorted((entry["category"], entry["count"]) for entry in snapshot["top_pattern_categories"]) == \
+        [("fraud", 1), ("hacking", 1)]
+    assert snapshot["top_phrases"] == [{"phrase": "hack into the server", "count": 1}]
+
+
+if __name__ == "__main__":
+    print("📡 DETECTION ANALYTICS TEST")
+    print("=" * 60)
+    for test in (test_add_stays_within_error_bound,
+                 test_merge_stays_within_combined_error_bound,
+                 test_merge_below_capacity_is_exact,
+                 test_record_result_counts_scored_pattern_categories):
+        test()
+        print(f"✅ {test.__name__}")
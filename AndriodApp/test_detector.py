@@ -8,6 +8,8 @@ import re
 from difflib import SequenceMatcher
 from typing import Dict, Any
 
+from rule_scores import PATTERN_HIT, CONTEXT_HIT, INTENT_HIT
+
 class SimpleContentDetector:
     def __init__(self):
         """Initialize the simple content detector"""
@@ -135,6 +137,15 @@ class SimpleContentDetector:
             "how to", "how can i", "give me", "show me", "teach me",
             "what is the best", "best way to", "help me", "i want to"
         ]
+        
+        # Stage weights and detection threshold (tuned with tune_weights.py)
+        self.stage_weights = {
+            "pattern": 0.4,
+            "context": 0.3,
+            "similarity": 0.3,
+            "intent": 0.2
+        }
+        self.detection_threshold = 0.5
 
     def preprocess_text(self, text: str) -> str:
         """Clean and normalize text"""
@@ -155,7 +166,7 @@ class SimpleContentDetector:
             score = 0.0
             for pattern in patterns:
                 if re.search(pattern, text_lower, re.IGNORECASE):
-                    score += 0.3
+                    score += PATTERN_HIT
             results[category] = min(score, 1.0)
         
         return results
@@ -169,7 +180,7 @@ class SimpleContentDetector:
             score = 0.0
             for word in context_words:
                 if word in text_lower:
-                    score += 0.2
+                    score += CONTEXT_HIT
             results[category] = min(score, 1.0)
         
         return results
@@ -181,7 +192,7 @@ class SimpleContentDetector:
         
         for indicator in self.intent_indicators:
             if indicator in text_lower:
-                score += 0.3
+                score += INTENT_HIT
         
         return min(score, 1.0)
 
@@ -219,12 +230,13 @@ class SimpleContentDetector:
         similarity_scores = self.check_reference_similarity(text)
         
         # Combine scores
+        weights = self.stage_weights
         combined_scores = {}
         for category in pattern_scores.keys():
             combined_scores[category] = (
-                pattern_scores.get(category, 0.0) * 0.4 +
-                context_scores.get(category, 0.0) * 0.3 +
-                similarity_scores.get(category, 0.0) * 0.3
+                pattern_scores.get(category, 0.0) * weights["pattern"] +
+                context_scores.get(category, 0.0) * weights["context"] +
+                similarity_scores.get(category, 0.0) * weights["similarity"]
             )
         
         # Find the highest scoring category
@@ -233,10 +245,10 @@ class SimpleContentDetector:
             max_score = combined_scores[max_category]
             
             # Add intent score to the final score
-            final_score = min(max_score + intent_score * 0.2, 1.0)
+            final_score = min(max_score + intent_score * weights["intent"], 1.0)
             
             # Determine if content should be detected
-            if final_score > 0.5:  # Lower threshold for simple detector
+            if final_score > self.detection_threshold:  # Lower threshold for simple detector
                 results["is_detected"] = True
                 results["category"] = max_category
                 results["confidence"] = final_score
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test for the debounced keystroke scheduler
+Checks that a burst of keystrokes is analyzed once, that a check overtaken
+by newer text is discarded, and that a failing check does not silence its
+field
+"""
+
+import threading
+
+from keystroke_scheduler import KeystrokeScheduler, simulate_typing
+from test_detector import SimpleContentDetector
+
+
+class RaisingDetector:
+    """Fails on texts containing "boom", otherwise defers to the simple detector"""
+
+    def __init__(self):
+        self.detector = SimpleContentDetector()
+
+    def detect_content(self, text):
+        if "boom" in text:
+            raise RuntimeError("detector failure")
+        return self.detector.detect_content(text)
+
+
+def test_burst_is_analyzed_once():
+    scheduler = KeystrokeScheduler(SimpleContentDetector(), debounce_ms=300, clock=lambda: 0.0)
+    phrase = "hack into wifi"
+    end = simulate_typing(scheduler, "chat", "message", phrase, 0.0, keystroke_ms=50)
+    completed = scheduler.poll(end + 0.3)
+    assert [(app, text) for app, _, text, _ in completed] == [("chat", phrase)]
+    stats = scheduler.get_stats(end)["chat"]
+    assert stats["updates"] == len(phrase) and stats["analyses"] == 1
+    # Unchanged text is not analyzed again
+    scheduler.update("chat", "message", phrase, now=end + 1.0)
+    assert scheduler.poll(end + 2.0) == []
+
+
+def test_stale_check_is_discarded():
+    scheduler = None
+
+    class TypingDuringCheck:
+        def detect_content(self, text):
+            if text == "hack":
+                # The user keeps typing while the first check runs
+                scheduler.update("chat", "message", "hack into wifi", now=1.0)
+            return SimpleContentDetector().detect_content(text)
+
+    scheduler = KeystrokeScheduler(TypingDuringCheck(), debounce_ms=300, clock=lambda: 0.0)
+    scheduler.update("chat", "message", "hack", now=0.0)
+    assert scheduler.poll(0.5) == []
+    assert scheduler.get_stats(0.5)["chat"]["cancelled"] == 1
+    completed = scheduler.poll(1.5)
+    assert [text for _, _, text, _ in completed] == ["hack into wifi"]
+
+
+def test_failed_check_keeps_field_alive():
+    scheduler = KeystrokeScheduler(RaisingDetector(), debounce_ms=300, clock=lambda: 0.0)
+    scheduler.update("chat", "message", "boom boom", now=0.0)
+    assert scheduler.poll(0.5) == []
+    assert scheduler.get_stats(0.5)["chat"]["errors"] == 1
+    scheduler.update("chat", "message", "hack into wifi", now=1.0)
+    assert [text for _, _, text, _ in scheduler.poll(1.5)] == ["hack into wifi"]
+
+
+def test_failed_background_check_keeps_field_alive():
+    done = threading.Event()
+    results = []
+
+    def on_result(app, field, text, result):
+        results.append(text)
+        done.set()
+
+    scheduler = KeystrokeScheduler(RaisingDetector(), debounce_ms=10, max_wait_ms=50, on_result=on_result)
+    scheduler.start(workers=1)
+    try:
+        scheduler.update("chat", "message", "boom boom")
+        for _ in range(200):
+            if scheduler.get_stats()["chat"]["errors"]:
+                break
+            threading.Event().wait(0.01)
+        assert scheduler.get_stats()["chat"]["errors"] == 1
+        scheduler.update("chat", "message", "hack into wifi")
+        assert done.wait(5.0) and results == ["hack into wifi"]
+    finally:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    print("⌨️  KEYSTROKE SCHEDULER TEST")
+    print("=" * 60)
+    for test in (test_burst_is_analyzed_once,
+                 test_stale_check_is_discarded,
+                 test_failed_check_keeps_field_alive,
+                 test_failed_background_check_keeps_field_alive):
+        test()
+        print(f"✅ {test.__name__}")
@@ -7,6 +7,19 @@ Shows how the improved detection works continuously across apps
 import time
 import random
 
+from detection_analytics import DetectionAnalytics
+
+# Demo keywords and the detector category each one stands for
+KEYWORD_CATEGORIES = {
+    "password": "privacy_violation",
+    "hack": "hacking",
+    "face": "deepfake_face_manipulation",
+    "explosive": "illegal_activities",
+    "drug": "illegal_activities",
+    "credit": "privacy_violation",
+    "aadhaar": "privacy_violation"
+}
+
 class PersistentDetectionDemo:
     def __init__(self):
         self.apps = [
@@ -24,7 +37,7 @@ class PersistentDetectionDemo:
         ]
         
         self.detection_count = 0
-        self.app_detection_stats = {app: 0 for app in self.apps}
+        self.analytics = DetectionAnalytics(window_seconds=300, buckets=30, top_k=16)
     
     def simulate_typing(self, app_name, phrase, attempt_number):
         print(f"\n📱 {app_name} - Attempt #{attempt_number}")
@@ -32,9 +45,11 @@ class PersistentDetectionDemo:
         time.sleep(0.3)
         
         # Simulate detection with persistence
-        if any(keyword in phrase.lower() for keyword in ['password', 'hack', 'face', 'explosive', 'drug', 'credit', 'aadhaar']):
+        matched = [keyword for keyword in KEYWORD_CATEGORIES if keyword in phrase.lower()]
+        category = KEYWORD_CATEGORIES[matched[0]] if matched else "safe"
+        self.analytics.record(app_name, category, bool(matched), matched, phrase)
+        if matched:
             self.detection_count += 1
-            self.app_detection_stats[app_name] += 1
             
             print(f"🚨 DETECTED: Misuse in {app_name}!")
             print(f"📱 Showing sliding notification...")
@@ -72,7 +87,9 @@ class PersistentDetectionDemo:
         print(f"🔄 Tested {len(self.apps)} apps across multiple rounds")
         
         print(f"\n📈 DETECTION STATS BY APP:")
-        for app, count in self.app_detection_stats.items():
+        window_apps = {entry["app"]: entry["detections"] for entry in self.analytics.snapshot()["window"]["apps"]}
+        for app in self.apps:
+            count = window_apps.get(app, 0)
             status = "✅ WORKING" if count > 0 else "❌ NEEDS ATTENTION"
             print(f"  • {app}: {count} detections - {status}")
         
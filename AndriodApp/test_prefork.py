@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test for the pre-fork worker pool
+Checks that forked workers return the serial results in order, that every
+worker reports its memory and that closing the pool frees the
+shared-memory segment
+"""
+
+import os
+from functools import partial
+from multiprocessing import shared_memory
+
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+from prefork import PreforkDetectorPool, share_numeric_tables
+
+
+def test_pool_matches_serial_detection():
+    serial = ContentDetector(profile="lite")
+    texts = TEST_SENTENCES * 3
+    with PreforkDetectorPool(partial(ContentDetector, profile="lite"), workers=2) as pool:
+        assert pool.detect_batch(texts, chunksize=4) == [serial.detect_content(text) for text in texts]
+
+        report = pool.memory_report()
+        pids = {worker["pid"] for worker in report["workers"]}
+        assert len(pids) == 2 and os.getpid() not in pids
+
+
+def test_close_stops_workers_and_unlinks_segment():
+    pool = PreforkDetectorPool(partial(ContentDetector, profile="lite"), workers=2)
+    name = pool.tables.segment.name
+    workers = list(pool._pool._pool)
+    pool.close()
+
+    assert pool.tables is None
+    assert all(not worker.is_alive() for worker in workers)
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        pass
+    else:
+        raise AssertionError(f"shared-memory segment {name} still exists")
+
+
+def test_without_spacy_nothing_is_shared():
+    tables = share_numeric_tables(ContentDetector(profile="lite"))
+    try:
+        assert tables.size == 0 and tables.views == []
+    finally:
+        tables.release()
+
+
+if __name__ == "__main__":
+    print("🍴 PRE-FORK POOL TEST")
+    print("=" * 60)
+    for test in (test_pool_matches_serial_detection,
+                 test_close_stops_workers_and_unlinks_segment,
+                 test_without_spacy_nothing_is_shared):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test for exact, bound-pruned reference similarity
+Checks that the cached and pruned matchers give bit-identical scores to
+comparing every reference sentence in full, on short, long and unusual
+inputs and with many references per category
+"""
+
+import random
+
+from benchmark_profiles import unpruned_similarity
+from category_index import synthetic_categories
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+from test_compiled_ruleset import EXTRA_SENTENCES
+
+
+def varied_inputs(detector, count: int = 40, seed: int = 7):
+    """Test sentences plus random mixes of reference words, some very long"""
+    rng = random.Random(seed)
+    words = [word for sentences in detector.reference_sentences.values()
+             for sentence in sentences for word in sentence.split()]
+    texts = TEST_SENTENCES + EXTRA_SENTENCES + ["ǅemo ﬁle 🙂 face swap", "a", "?" * 300]
+    for _ in range(count):
+        length = rng.choice((3, 12, 40, 150))
+        texts.append(" ".join(rng.choice(words) for _ in range(length)))
+    return texts
+
+
+def assert_exact(detector):
+    for text in varied_inputs(detector):
+        assert detector.check_reference_similarity(text) == unpruned_similarity(detector, text), text[:80]
+
+
+def test_pruned_similarity_is_exact():
+    assert_exact(ContentDetector(profile="lite"))
+
+
+def test_pruned_similarity_is_exact_with_many_references():
+    detector = ContentDetector(profile="lite")
+    references = {category: list(sentences) + [f"{sentence} {other}" for sentence in sentences
+                                               for other in TEST_SENTENCES[:4]]
+                  for category, sentences in detector.reference_sentences.items()}
+    detector.reference_sentences = references
+    synthetic_categories(detector, 2)
+    assert_exact(detector)
+
+
+if __name__ == "__main__":
+    print("🔍 REFERENCE SIMILARITY TEST")
+    print("=" * 60)
+    for test in (test_pruned_similarity_is_exact,
+                 test_pruned_similarity_is_exact_with_many_references):
+        test()
+        print(f"✅ {test.__name__}")
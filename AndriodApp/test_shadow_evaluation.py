@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test for shadow evaluation
+Checks that mirrors are dropped rather than blocking when the queue is full,
+that drain and close(drain=False) behave, that a failing candidate is
+counted instead of stopping the worker, and that the primary verdict is
+returned unchanged
+"""
+
+import threading
+
+from shadow_evaluation import ShadowEvaluator
+
+
+def verdict(category: str = "safe", confidence: float = 0.0):
+    return {"is_detected": category != "safe", "category": category, "confidence": confidence,
+            "reason": "", "details": {}}
+
+
+class Primary:
+    def detect_content(self, text):
+        return verdict()
+
+
+class Candidate:
+    """Detects "hack", raises on "boom" and, when gated, waits before answering"""
+
+    def __init__(self, gated: bool = False):
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+
+    def detect_content(self, text):
+        self.started.set()
+        self.gate.wait()
+        if "boom" in text:
+            raise RuntimeError("candidate failure")
+        return verdict("hacking", 0.9) if "hack" in text else verdict()
+
+
+def test_full_queue_drops_instead_of_blocking():
+    candidate = Candidate(gated=True)
+    shadow = ShadowEvaluator(Primary(), candidate, sample_rate=1.0, queue_size=2, seed=1)
+    first = shadow.detect_content("hello")
+    assert candidate.started.wait(5.0)  # the worker is now stuck on the first mirror
+    results = [shadow.detect_content(f"hello {i}") for i in range(5)]
+    assert first == verdict() and all(result == verdict() for result in results)
+    assert not shadow.drain(timeout=0.05)
+
+    candidate.gate.set()
+    assert shadow.drain(timeout=5.0)
+    report = shadow.get_report()
+    assert report["requests"] == 6 and report["mirrored"] == 3 and report["dropped"] == 3
+    assert report["compared"] == 3 and report["disagreements"] == 0
+    shadow.close()
+
+
+def test_candidate_errors_are_counted():
+    shadow = ShadowEvaluator(Primary(), Candidate(), sample_rate=1.0, seed=1)
+    for text in ("hack into wifi", "boom", "hello", "boom again", "hack the school"):
+        assert shadow.detect_content(text) == verdict()
+    assert shadow.drain(timeout=5.0)
+    report = shadow.get_report()
+    assert report["errors"] == 2 and report["compared"] == 3
+    assert report["disagreements"] == 2 and report["newly_detected"] == 2
+    assert report["transitions"] == {"safe -> hacking": 2}
+    shadow.close()
+
+
+def test_close_without_drain_discards_queued_mirrors():
+    candidate = Candidate(gated=True)
+    shadow = ShadowEvaluator(Primary(), candidate, sample_rate=1.0, queue_size=10, seed=1)
+    for i in range(4):
+        shadow.detect_content(f"hack {i}")
+    assert candidate.started.wait(5.0) and shadow.get_report()["queued"] == 3
+    closer = threading.Thread(target=shadow.close, kwargs={"drain": False})
+    closer.start()
+    # Let close() empty the queue (leaving its stop marker) before the worker moves on
+    for _ in range(500):
+        if shadow.get_report()["queued"] == 1:
+            break
+        threading.Event().wait(0.01)
+    candidate.gate.set()
+    closer.join(5.0)
+    assert not closer.is_alive()
+    # Only the mirror already being evaluated was compared
+    assert shadow.get_report()["compared"] == 1
+
+
+if __name__ == "__main__":
+    print("🌗 SHADOW EVALUATION TEST")
+    print("=" * 60)
+    for test in (test_full_queue_drops_instead_of_blocking,
+                 test_candidate_errors_are_counted,
+                 test_close_without_drain_discards_queued_mirrors):
+        test()
+        print(f"✅ {test.__name__}")
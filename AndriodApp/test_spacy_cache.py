@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test for the persistent spaCy feature cache
+Checks that cached features equal a fresh parse, survive reopening, are
+separated by model version and stay within the size bound
+"""
+
+import os
+import tempfile
+import time
+
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+from spacy_cache import SpacyFeatureCache
+
+
+def build_detector():
+    """Lite detector with a small rule-based pipeline, or None without spaCy"""
+    try:
+        import spacy
+    except ImportError:
+        return None
+    detector = ContentDetector(profile="lite")
+    detector.nlp = spacy.blank("en")
+    ruler = detector.nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PRODUCT", "pattern": "wifi"},
+                        {"label": "ORG", "pattern": [{"LOWER": "school"}]}])
+    return detector
+
+
+def test_cached_features_match_fresh_parse():
+    detector = build_detector()
+    if detector is None:
+        return
+    texts = [detector.preprocess_text(text) for text in TEST_SENTENCES] * 2
+    expected = detector.analyze_batch_with_spacy(texts)
+    assert any(features["entities"] for features in expected)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "spacy_cache.db")
+        detector.use_spacy_cache(path)
+        assert detector.analyze_batch_with_spacy(texts) == expected
+        detector.use_spacy_cache(path)  # reopen, as a later run would
+        assert detector.analyze_batch_with_spacy(texts) == expected
+        assert [detector.analyze_with_spacy(text) for text in texts] == expected
+        stats = detector.spacy_cache.get_stats()
+        assert stats["misses"] == 0 and stats["stored"] == 0
+        detector.use_spacy_cache(None)
+
+
+def test_cache_is_versioned_and_bounded():
+    features = {"entities": [], "verbs": ["hack"], "nouns": ["network"], "personal_pronouns": []}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "spacy_cache.db")
+        cache = SpacyFeatureCache(path, "model-a", max_entries=20)
+        cache.put_many({f"message {i}": features for i in range(50)})
+        assert cache.get_stats()["entries"] <= 20
+        assert cache.get_many(["message 49"]) == {"message 49": features}
+
+        other = SpacyFeatureCache(path, "model-b", max_entries=20)
+        assert other.get_many(["message 49"]) == {}
+        other.put_many({"message 49": features})
+        assert other.prune() > 0
+        assert cache.get_many(["message 49"]) == {}
+        cache.close()
+        other.close()
+
+
+def test_hits_are_touched_in_batches():
+    features = {"entities": [], "verbs": [], "nouns": ["wifi"], "personal_pronouns": []}
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SpacyFeatureCache(os.path.join(directory, "spacy_cache.db"), "model-a",
+                                  max_entries=20, touch_batch=5)
+        cache.put_many({f"message {i}": features for i in range(20)})
+        last_used = "SELECT MAX(last_used) FROM spacy_features"
+        stored_at = cache.conn.execute(last_used).fetchone()[0]
+        time.sleep(0.01)
+        assert cache.get_many(["message 0"]) == {"message 0": features}
+        assert cache.conn.execute(last_used).fetchone()[0] == stored_at  # nothing written yet
+
+        # Storing records the pending hit first, so eviction keeps it
+        cache.put_many({f"new {i}": features for i in range(5)})
+        assert cache.get_stats()["evicted"] > 0
+        assert cache.get_many(["message 0"]) == {"message 0": features}
+        cache.close()
+
+
+if __name__ == "__main__":
+    print("🧠 SPACY FEATURE CACHE TEST")
+    print("=" * 60)
+    for test in (test_cached_features_match_fresh_parse,
+                 test_cache_is_versioned_and_bounded,
+                 test_hits_are_touched_in_batches):
+        test()
+        print(f"✅ {test.__name__}")
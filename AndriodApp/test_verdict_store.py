@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test for the persistent verdict store
+Checks that an interrupted scan resumes from its checkpoint, that a ruleset
+change restarts the scan reusing unchanged stage scores, that pruning
+drops what older rules left behind and that a half-written result line is
+cut off on resume
+"""
+
+import json
+import os
+import tempfile
+
+from columnar_results import ColumnarWriter, load_columns
+from deepfake_detector import ContentDetector, TEST_SENTENCES
+from ruleset import export_ruleset, apply_ruleset, stage_versions
+from test_compiled_ruleset import EXTRA_SENTENCES
+from verdict_store import VerdictStore, detector_version, incremental_scan, _truncate_jsonl
+
+ROWS = TEST_SENTENCES + EXTRA_SENTENCES
+
+
+def test_interrupted_scan_resumes_from_checkpoint():
+    detector = ContentDetector(profile="lite")
+    store = VerdictStore(":memory:")
+    scan = incremental_scan(detector, ROWS, store, scan_id="nightly", batch_size=4)
+    # Asking for the fifth row completes (and checkpoints) the first batch
+    first = [next(scan) for _ in range(5)]
+    scan.close()
+
+    stats = {}
+    rest = list(incremental_scan(detector, ROWS, store, scan_id="nightly", batch_size=4, stats=stats))
+    assert stats["resumed_from"] == 4
+    assert [index for index, _ in rest] == list(range(4, len(ROWS)))
+    for index, result in first[:4] + rest:
+        expected = detector.detect_content(ROWS[index])
+        expected["details"]["spacy_analysis"] = {}
+        assert result == expected, ROWS[index]
+    assert store.get_checkpoint("nightly", detector_version(detector)) == 0
+    store.close()
+
+
+def test_columnar_output_resumes_from_checkpoint():
+    detector = ContentDetector(profile="lite")
+    categories = list(detector.patterns.keys())
+    store = VerdictStore(":memory:")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results")
+        writer = ColumnarWriter(path, categories)
+        scan = incremental_scan(detector, ROWS, store, scan_id="nightly", batch_size=4,
+                                before_checkpoint=lambda position: writer.flush())
+        # Row 4 is written past the checkpoint and must be cut off on resume
+        for _ in range(5):
+            writer.append(*next(scan))
+        scan.close()
+        writer.flush()
+        writer.close()
+
+        resume_at = store.get_checkpoint("nightly", detector_version(detector))
+        assert resume_at == 4
+        with ColumnarWriter(path, categories, keep_rows=resume_at) as writer:
+            for index, result in incremental_scan(detector, ROWS, store, scan_id="nightly", batch_size=4):
+                writer.append(index, result)
+        columns, _ = load_columns(path)
+        assert list(columns["offset"]) == list(range(len(ROWS)))
+        expected = [detector.detect_content(text)["is_detected"] for text in ROWS]
+        assert list(columns["is_detected"]) == expected
+        del columns
+    store.close()
+
+
+def test_ruleset_change_restarts_and_reuses_stages():
+    detector = ContentDetector(profile="lite")
+    store = VerdictStore(":memory:")
+    scan = incremental_scan(detector, ROWS, store, scan_id="nightly", batch_size=4)
+    for _ in range(5):
+        next(scan)
+    scan.close()
+
+    ruleset = export_ruleset(detector)
+    ruleset["detection_threshold"] = 0.5
+    apply_ruleset(detector, ruleset)
+    stats = {}
+    results = list(incremental_scan(detector, ROWS, store, scan_id="nightly", batch_size=4, stats=stats))
+    assert stats["resumed_from"] == 0 and len(results) == len(ROWS)
+    # Five rows were scored before the interruption; a threshold change reuses all their stages
+    assert stats["verdict_hits"] == 0 and stats["stage_reuse"] == 5
+    store.close()
+
+
+def test_prune_drops_stale_stage_scores():
+    detector = ContentDetector(profile="lite")
+    store = VerdictStore(":memory:")
+    list(incremental_scan(detector, ROWS, store))
+
+    ruleset = export_ruleset(detector)
+    ruleset["patterns"]["hacking"].append(r"zero[- ]day")
+    apply_ruleset(detector, ruleset)
+    list(incremental_scan(detector, ROWS, store))
+    versions = stage_versions(detector)
+    assert store.prune(detector_version(detector), versions) > 0
+
+    rows = store.conn.execute("SELECT stage, stage_version FROM stage_scores").fetchall()
+    assert rows and all(versions[stage] == version for stage, version in rows)
+    assert store.conn.execute("SELECT COUNT(DISTINCT ruleset_version) FROM verdicts").fetchone()[0] == 1
+    store.close()
+
+
+def test_truncate_drops_half_written_line():
+    rows = [json.dumps({"row": index, "is_detected": False}) + "\n" for index in range(4)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.jsonl")
+        for tail in ('{"row": 4, "is_det', '{"row": 4}', '{"is_detected": true}\n', "\n"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(rows)
+                f.write(tail)
+            _truncate_jsonl(path, 10)
+            with open(path, encoding="utf-8") as f:
+                assert f.readlines() == rows, tail
+
+        _truncate_jsonl(path, 2)
+        with open(path, encoding="utf-8") as f:
+            assert f.readlines() == rows[:2]
+
+
+if __name__ == "__main__":
+    print("🗄️  VERDICT STORE TEST")
+    print("=" * 60)
+    for test in (test_interrupted_scan_resumes_from_checkpoint,
+                 test_columnar_output_resumes_from_checkpoint,
+                 test_ruleset_change_restarts_and_reuses_stages,
+                 test_prune_drops_stale_stage_scores,
+                 test_truncate_drops_half_written_line):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Thread-Safe Detection
+Shares one detector and its frozen rule tables between threads, with a
+thread-pool mode that overlaps spaCy batches with the rule-based stages
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Any
+
+
+def freeze_rules(detector) -> None:
+    """Make a detector's rule tables read-only and precompile its patterns
+
+    After freezing, accidental mutation of ``patterns``,
+    ``malicious_context_words``, ``reference_sentences``,
+    ``intent_indicators`` or ``stage_weights`` raises instead of racing with
+    readers. Rules can still be swapped as a whole with ``apply_ruleset``.
+    A ContentDetector's patterns are compiled here into read-only tuples
+    of ``re.Pattern`` (``compiled_patterns()``) that every thread and
+    stage shares, so no thread compiles them on the hot path. spaCy calls
+    are not parallel: one ``_nlp_lock`` per detector serializes them all.
+    """
+    for field in ("reference_sentences", "patterns", "malicious_context_words"):
+        table = getattr(detector, field)
+        setattr(detector, field, MappingProxyType({
+            category: tuple(entries) for category, entries in table.items()
+        }))
+    detector.intent_indicators = tuple(detector.intent_indicators)
+    detector.stage_weights = MappingProxyType(dict(detector.stage_weights))
+
+    if hasattr(detector, "compiled_patterns"):
+        detector.compiled_patterns()
+    else:
+        for patterns in detector.patterns.values():
+            for pattern in patterns:
+                re.compile(pattern, re.IGNORECASE)
+
+
+class ThreadSafeDetector:
+    """One detector instance shared safely by any number of threads
+
+    ``detect_content`` may be called concurrently from request threads.
+    ``detect_batch`` is the thread-pool mode: the spaCy pipeline runs over
+    the whole batch with ``nlp.pipe`` on one worker while the regex, keyword
+    and similarity stages score chunks of the batch on the others. The
+    overlap is real only where a stage releases the GIL (spaCy's compiled
+    model code does; pure-Python stages mostly do not), so the speed-up
+    grows with the share of time spent in spaCy.
+    """
+
+    def __init__(self, detector=None, max_workers: int = None,
+                 chunk_size: int = 32, spacy_batch_size: int = 64):
+        """Wrap ``detector`` (a new ContentDetector by default) and freeze its rules"""
+        if detector is None:
+            from deepfake_detector import ContentDetector
+            detector = ContentDetector()
+        freeze_rules(detector)
+        self.detector = detector
+        self.chunk_size = chunk_size
+        self.spacy_batch_size = spacy_batch_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(8, (os.cpu_count() or 1) + 1),
+            thread_name_prefix="detector"
+        )
+
+    def detect_content(self, text: str) -> Dict[str, Any]:
+        """Detect a single text; safe to call from any thread"""
+        return self.detector.detect_content(text)
+
+    def _score_chunk(self, texts: List[str]) -> List[Dict[str, Any]]:
+        if hasattr(self.detector, "score_text"):
+            prepared = [self.detector.prepare_text(text) for text in texts]
+            classifier = getattr(self.detector, "classifier", None)
+            if classifier is not None and not self.detector.stage_weights.get("classifier"):
+                # Weighted 0: score_text skips it, so skip the batch product too
+                classifier = None
+            # One sparse product scores the whole chunk
+            classifier_scores = classifier.score_batch(prepared) if classifier else [None] * len(prepared)
+            return [self.detector.score_text(text, scores) for text, scores in zip(prepared, classifier_scores)]
+        return [self.detector.detect_content(text) for text in texts]
+
+    def detect_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Detect many texts on the thread pool; results match detect_content"""
+        spacy_future = None
+        if getattr(self.detector, "nlp", None) and hasattr(self.detector, "analyze_batch_with_spacy"):
+            prepared = [self.detector.preprocess_text(text) for text in texts]
+            spacy_future = self._executor.submit(
+                self.detector.analyze_batch_with_spacy, prepared, self.spacy_batch_size
+            )
+
+        chunk_futures = [
+            self._executor.submit(self._score_chunk, texts[i:i + self.chunk_size])
+            for i in range(0, len(texts), self.chunk_size)
+        ]
+        results = [result for future in chunk_futures for result in future.result()]
+
+        if spacy_future is not None:
+            for result, analysis in zip(results, spacy_future.result()):
+                result["details"]["spacy_analysis"] = analysis
+        return results
+
+    def close(self) -> None:
+        """Shut down the worker threads"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Weight and Threshold Tuning Harness
+Scores a labeled corpus once per stage, then sweeps stage weights and
+detection thresholds in numpy to find the best trade-off
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import time
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from ruleset import export_ruleset, save_ruleset, stage_versions
+
+SAFE_LABELS = {"", "safe", "none", "0", "false"}
+
+# Stages whose latency is saved when their weight is tuned down to zero;
+# ContentDetector.score_text skips a stage weighted 0 (with the category
+# index, pattern, context and intent share one pass and only similarity is
+# skipped)
+WEIGHTED_STAGES = ("pattern", "context", "similarity", "intent")
+
+
+def load_labeled_corpus(path: str) -> Tuple[List[str], List[str]]:
+    """Load (text, label) rows from a .jsonl or .csv file
+
+    The label is a category name, or "safe" for content that should pass.
+    """
+    texts, labels = [], []
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                texts.append(row["text"])
+                labels.append(str(row.get("label", "safe")))
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                texts.append(row["text"])
+                labels.append(row.get("label") or "safe")
+    return texts, labels
+
+
+def compute_stage_matrices(detector, texts: List[str]) -> Dict[str, Any]:
+    """Run every scoring stage once per text and collect the scores
+
+    Returns N x C matrices for the per-category stages, an N vector for the
+    intent stage and the mean latency of each stage in milliseconds. Category
+    columns follow the order of ``detector.patterns``, which is the order
+    ``detect_content`` uses to pick the highest scoring category.
+    """
+    categories = list(detector.patterns.keys())
+    n = len(texts)
+    matrices = {
+        "pattern": np.zeros((n, len(categories))),
+        "context": np.zeros((n, len(categories))),
+        "similarity": np.zeros((n, len(categories))),
+        "intent": np.zeros(n)
+    }
+    stage_time = {stage: 0.0 for stage in WEIGHTED_STAGES}
+    preprocess_time = 0.0
+
+    for row, raw_text in enumerate(texts):
+        start = time.perf_counter()
+        text = detector.preprocess_text(raw_text)
+        preprocess_time += time.perf_counter() - start
+
+        for stage, check in (
+            ("pattern", detector.check_pattern_matching),
+            ("context", detector.check_context_words),
+            ("similarity", detector.check_reference_similarity)
+        ):
+            start = time.perf_counter()
+            scores = check(text)
+            stage_time[stage] += time.perf_counter() - start
+            matrices[stage][row] = [scores.get(category, 0.0) for category in categories]
+
+        start = time.perf_counter()
+        matrices["intent"][row] = detector.check_intent_indicators(text)
+        stage_time["intent"] += time.perf_counter() - start
+
+    per_row = 1000.0 / max(n, 1)
+    matrices["source"] = np.array(matrices_source(detector, texts))
+    matrices["categories"] = np.array(categories)
+    matrices["latency_ms"] = np.array([stage_time[stage] * per_row for stage in WEIGHTED_STAGES])
+    matrices["base_latency_ms"] = np.array(preprocess_time * per_row)
+    return matrices
+
+
+def matrices_source(detector, texts: List[str]) -> str:
+    """Content hash of the corpus and of the rules the stage matrices come from"""
+    digest = hashlib.sha256()
+    versions = stage_versions(detector)
+    digest.update(json.dumps([versions[stage] for stage in WEIGHTED_STAGES]).encode("utf-8"))
+    digest.update(json.dumps(list(detector.patterns.keys())).encode("utf-8"))
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def save_matrices(matrices: Dict[str, Any], path: str) -> None:
+    """Cache stage matrices so later sweeps can skip scoring entirely"""
+    np.savez_compressed(path, **matrices)
+
+
+def load_matrices(path: str) -> Dict[str, Any]:
+    """Load stage matrices written by save_matrices"""
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def simplex_grid(step: float = 0.1) -> List[Tuple[float, float, float]]:
+    """Pattern/context/similarity weight triples that sum to 1.0"""
+    steps = int(round(1.0 / step))
+    grid = []
+    for i, j in itertools.product(range(steps + 1), repeat=2):
+        if i + j <= steps:
+            grid.append((round(i * step, 6), round(j * step, 6), round((steps - i - j) * step, 6)))
+    return grid
+
+
+def sweep(matrices: Dict[str, Any], labels: List[str],
+          weight_grid: List[Tuple[float, float, float]],
+          intent_weights: List[float], thresholds: List[float]) -> List[Dict[str, Any]]:
+    """Evaluate every weight/threshold combination on precomputed scores
+
+    A row counts as a true positive when it is detected and its label is a
+    category; ``category_accuracy`` additionally requires the detected
+    category to match the label.
+    """
+    categories = list(matrices["categories"])
+    pattern, context, similarity = matrices["pattern"], matrices["context"], matrices["similarity"]
+    intent = matrices["intent"]
+    stage_latency = dict(zip(WEIGHTED_STAGES, matrices["latency_ms"]))
+    base_latency = float(matrices["base_latency_ms"])
+
+    label_array = np.array([label.lower() for label in labels])
+    positive = ~np.isin(label_array, list(SAFE_LABELS))
+    category_index = {category: i for i, category in enumerate(categories)}
+    label_index = np.array([category_index.get(label, -1) for label in label_array])
+    total_positive = max(int(positive.sum()), 1)
+    threshold_array = np.asarray(thresholds)
+
+    rows = []
+    for w_pattern, w_context, w_similarity in weight_grid:
+        # Same operation order as detect_content so scores match exactly
+        combined = pattern * w_pattern + context * w_context + similarity * w_similarity
+        best = combined.argmax(axis=1)
+        max_score = combined[np.arange(len(best)), best]
+        right_category = best == label_index
+
+        for w_intent in intent_weights:
+            final = np.minimum(max_score + intent * w_intent, 1.0)
+            detected = final[:, None] > threshold_array[None, :]
+
+            true_positive = (detected & positive[:, None]).sum(axis=0)
+            category_hits = (detected & right_category[:, None]).sum(axis=0)
+            predicted = detected.sum(axis=0)
+            precision = np.where(predicted > 0, true_positive / np.maximum(predicted, 1), 1.0)
+            recall = true_positive / total_positive
+            f1 = np.where(precision + recall > 0,
+                          2 * precision * recall / np.maximum(precision + recall, 1e-12), 0.0)
+
+            weights = {"pattern": w_pattern, "context": w_context,
+                       "similarity": w_similarity, "intent": w_intent}
+            latency = base_latency + sum(
+                stage_latency[stage] for stage, weight in weights.items() if weight > 0
+            )
+            for t, threshold in enumerate(thresholds):
+                rows.append({
+                    "weights": weights,
+                    "threshold": float(threshold),
+                    "precision": float(precision[t]),
+                    "recall": float(recall[t]),
+                    "f1": float(f1[t]),
+                    "category_accuracy": float(category_hits[t] / total_positive),
+                    "latency_ms": float(latency)
+                })
+    return rows
+
+
+def choose_config(rows: List[Dict[str, Any]], min_precision: float = None) -> Dict[str, Any]:
+    """Pick the best row: highest recall at the precision floor, else best F1"""
+    if min_precision is not None:
+        eligible = [row for row in rows if row["precision"] >= min_precision]
+        if eligible:
+            return max(eligible, key=lambda row: (row["recall"], row["f1"], -row["latency_ms"]))
+        print(f"⚠️  No configuration reaches precision {min_precision:.2f}, using best F1")
+    return max(rows, key=lambda row: (row["f1"], row["recall"], -row["latency_ms"]))
+
+
+def pareto_front(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rows not beaten on precision, recall and latency by any other row"""
+    ordered = sorted(rows, key=lambda row: (row["latency_ms"], -row["precision"], -row["recall"]))
+    front = []
+    for row in ordered:
+        dominated = any(
+            other["precision"] >= row["precision"] and other["recall"] >= row["recall"]
+            for other in front
+        )
+        if not dominated:
+            front.append(row)
+    return front
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Render sweep rows as a plain text trade-off table"""
+    lines = [
+        f"{'pattern':>7} {'context':>7} {'simil':>6} {'intent':>6} {'thresh':>6} "
+        f"{'prec':>6} {'recall':>6} {'f1':>6} {'cat_acc':>7} {'ms':>7}"
+    ]
+    for row in rows:
+        w = row["weights"]
+        lines.append(
+            f"{w['pattern']:7.2f} {w['context']:7.2f} {w['similarity']:6.2f} {w['intent']:6.2f} "
+            f"{row['threshold']:6.2f} {row['precision']:6.3f} {row['recall']:6.3f} "
+            f"{row['f1']:6.3f} {row['category_accuracy']:7.3f} {row['latency_ms']:7.3f}"
+        )
+    return "\n".join(lines)
+
+
+def build_detector(kind: str):
+    """Create the detector whose rules are being tuned"""
+    if kind == "simple":
+        from test_detector import SimpleContentDetector
+        return SimpleContentDetector()
+    from deepfake_detector import ContentDetector
+    return ContentDetector()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Tune detector stage weights and threshold")
+    parser.add_argument("corpus", help="labeled corpus (.jsonl or .csv with text,label)")
+    parser.add_argument("--detector", choices=["full", "simple"], default="full")
+    parser.add_argument("--matrices", help="cache file for stage scores (.npz)")
+    parser.add_argument("--output", default="tuned_ruleset.json", help="ruleset to write")
+    parser.add_argument("--min-precision", type=float, default=None)
+    parser.add_argument("--step", type=float, default=0.1, help="weight grid step")
+    parser.add_argument("--top", type=int, default=15, help="rows to print")
+    args = parser.parse_args()
+
+    detector = build_detector(args.detector)
+    texts, labels = load_labeled_corpus(args.corpus)
+    print(f"📂 Loaded {len(texts)} labeled rows from {args.corpus}")
+
+    matrices = None
+    if args.matrices:
+        try:
+            matrices = load_matrices(args.matrices)
+            if "source" not in matrices or str(matrices["source"]) != matrices_source(detector, texts):
+                print("⚠️  Cached matrices are for another corpus or ruleset, rescoring")
+                matrices = None
+            else:
+                print(f"♻️  Reusing stage scores from {args.matrices}")
+        except FileNotFoundError:
+            pass
+
+    if matrices is None:
+        start = time.perf_counter()
+        matrices = compute_stage_matrices(detector, texts)
+        print(f"⏱️  Scored all stages in {time.perf_counter() - start:.1f}s")
+        if args.matrices:
+            save_matrices(matrices, args.matrices)
+
+    thresholds = [round(t, 2) for t in np.arange(0.30, 0.85, 0.05)]
+    intent_weights = [0.0, 0.1, 0.2, 0.3, 0.4]
+    start = time.perf_counter()
+    rows = sweep(matrices, labels, simplex_grid(args.step), intent_weights, thresholds)
+    print(f"⚡ Evaluated {len(rows)} configurations in {time.perf_counter() - start:.2f}s")
+
+    print("\n📈 PRECISION / RECALL / LATENCY FRONT")
+    print(format_table(pareto_front(rows)[:args.top]))
+
+    best = choose_config(rows, args.min_precision)
+    print("\n🏆 CHOSEN CONFIGURATION")
+    print(format_table([best]))
+
+    detector.stage_weights = dict(best["weights"])
+    detector.detection_threshold = best["threshold"]
+    save_ruleset(export_ruleset(detector), args.output)
+    print(f"\n💾 Ruleset written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Persistent Verdict Store
+SQLite cache of verdicts and per-stage scores keyed by normalized-text hash
+and ruleset version, used to re-scan message archives incrementally
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, List, Any, Iterable, Iterator, Tuple
+
+from prepared_text import PreparedText
+from ruleset import export_ruleset, stage_versions
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    text_hash TEXT NOT NULL,
+    ruleset_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (text_hash, ruleset_version)
+);
+CREATE TABLE IF NOT EXISTS stage_scores (
+    text_hash TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    stage_version TEXT NOT NULL,
+    scores TEXT NOT NULL,
+    PRIMARY KEY (text_hash, stage, stage_version)
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    scan_id TEXT PRIMARY KEY,
+    ruleset_version TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def text_hash(text) -> str:
+    """Hash of the normalized text, so case and spacing variants share a key"""
+    return hashlib.sha256(PreparedText.of(text).text.encode("utf-8")).hexdigest()
+
+
+class VerdictStore:
+    def __init__(self, path: str = "verdicts.db"):
+        """Open (or create) the store; ``":memory:"`` keeps it in RAM"""
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def get_verdicts(self, hashes: List[str], ruleset_version: str) -> Dict[str, Dict[str, Any]]:
+        """Cached results for the given text hashes"""
+        found = {}
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT text_hash, result FROM verdicts WHERE ruleset_version = ? "
+                f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                [ruleset_version] + chunk
+            )
+            found.update((h, json.loads(result)) for h, result in rows)
+        return found
+
+    def get_stage_scores(self, digest: str, versions: Dict[str, str]) -> Dict[str, Any]:
+        """Cached stage scores of one text whose stage version still matches"""
+        rows = self.conn.execute(
+            "SELECT stage, stage_version, scores FROM stage_scores WHERE text_hash = ?", (digest,)
+        )
+        return {stage: json.loads(scores) for stage, version, scores in rows
+                if versions.get(stage) == version}
+
+    def put(self, digest: str, ruleset_version: str, result: Dict[str, Any],
+            stage_scores: Dict[str, Any], versions: Dict[str, str]) -> None:
+        """Store a verdict and the stage scores it was built from"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)",
+            (digest, ruleset_version, json.dumps(result))
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO stage_scores VALUES (?, ?, ?, ?)",
+            [(digest, stage, versions[stage], json.dumps(scores))
+             for stage, scores in stage_scores.items()]
+        )
+
+    def get_checkpoint(self, scan_id: str, ruleset_version: str) -> int:
+        """Rows of ``scan_id`` already processed with this ruleset (0 if none)"""
+        row = self.conn.execute(
+            "SELECT position FROM checkpoints WHERE scan_id = ? AND ruleset_version = ?",
+            (scan_id, ruleset_version)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def save_checkpoint(self, scan_id: str, ruleset_version: str, position: int) -> None:
+        """Record progress and commit everything stored so far"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+            (scan_id, ruleset_version, position, time.time())
+        )
+        self.conn.commit()
+
+    def clear_checkpoint(self, scan_id: str) -> None:
+        """Forget a finished scan"""
+        self.conn.execute("DELETE FROM checkpoints WHERE scan_id = ?", (scan_id,))
+        self.conn.commit()
+
+    def prune(self, ruleset_version: str, versions: Dict[str, str] = None) -> int:
+        """Drop verdicts of other ruleset versions; returns rows removed
+
+        With ``versions`` (see ``stage_versions``) stage scores whose stage
+        version no longer matches are dropped too.
+        """
+        removed = self.conn.execute(
+            "DELETE FROM verdicts WHERE ruleset_version != ?", (ruleset_version,)
+        ).rowcount
+        for stage, version in (versions or {}).items():
+            removed += self.conn.execute(
+                "DELETE FROM stage_scores WHERE stage = ? AND stage_version != ?", (stage, version)
+            ).rowcount
+        self.conn.commit()
+        return removed
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+
+def detector_version(detector) -> str:
+    """Ruleset version plus the detector profile and classifier, which change results"""
+    version = export_ruleset(detector)["version"]
+    version = f"{version}:{getattr(detector, 'profile', type(detector).__name__)}"
+    classifier = getattr(detector, "classifier", None)
+    return f"{version}:{classifier.version}" if classifier else version
+
+
+def _score_row(detector, text: str, cached: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Score only the stages without a valid cached result (spaCy is never stored)"""
+    prepared = detector.prepare_text(text)
+    checks = {
+        "pattern": detector.check_pattern_matching,
+        "context": detector.check_context_words,
+        "intent": detector.check_intent_indicators,
+        "similarity": detector.check_reference_similarity
+    }
+    fresh = {stage: check(prepared) for stage, check in checks.items() if stage not in cached}
+    scores = dict(cached, **fresh)
+    # Classifier scores are not cached; the stage is a single sparse product
+    classifier = getattr(detector, "classifier", None)
+    result = detector.combine_scores(scores["pattern"], scores["context"],
+                                     scores["intent"], scores["similarity"],
+                                     classifier.score(prepared) if classifier else None)
+    return result, fresh
+
+
+def incremental_scan(detector, rows: Iterable[str], store: VerdictStore,
+                     scan_id: str = None, batch_size: int = 500,
+                     stats: Dict[str, int] = None,
+                     before_checkpoint: Callable[[int], None] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(row_index, result)`` for every row, scoring as little as possible
+
+    Rows whose normalized text already has a verdict for this ruleset are
+    served from the store. Otherwise only stages whose rule table changed
+    are re-run (a weight or threshold change re-runs none) and the rest is
+    taken from cached stage scores. With ``scan_id`` progress is
+    checkpointed after every batch and an interrupted scan resumes after
+    the last completed batch. ``before_checkpoint(position)`` runs right
+    before each checkpoint is committed, so callers can flush whatever
+    they wrote for the rows before ``position``.
+    """
+    version = detector_version(detector)
+    versions = stage_versions(detector)
+    incremental = hasattr(detector, "combine_scores") and hasattr(detector, "prepare_text")
+    stats = stats if stats is not None else {}
+    for key in ("rows", "resumed_from", "verdict_hits", "stage_reuse", "scored"):
+        stats.setdefault(key, 0)
+
+    start = store.get_checkpoint(scan_id, version) if scan_id else 0
+    stats["resumed_from"] = start
+
+    def flush(batch: List[Tuple[int, str]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        digests = [text_hash(text) for _, text in batch]
+        known = store.get_verdicts(list(set(digests)), version)
+        for (index, text), digest in zip(batch, digests):
+            result = known.get(digest)
+            if result is not None:
+                stats["verdict_hits"] += 1
+            elif incremental:
+                cached = store.get_stage_scores(digest, versions)
+                result, fresh = _score_row(detector, text, cached)
+                store.put(digest, version, result, fresh, versions)
+                stats["stage_reuse" if cached else "scored"] += 1
+                known[digest] = result
+            else:
+                result = detector.detect_content(text)
+                store.put(digest, version, result, {}, versions)
+                stats["scored"] += 1
+                known[digest] = result
+            stats["rows"] += 1
+            yield index, result
+        if scan_id:
+            if before_checkpoint is not None:
+                before_checkpoint(batch[-1][0] + 1)
+            store.save_checkpoint(scan_id, version, batch[-1][0] + 1)
+
+    batch = []
+    for index, text in enumerate(rows):
+        if index < start:
+            continue
+        batch.append((index, text))
+        if len(batch) >= batch_size:
+            yield from flush(batch)
+            batch = []
+    if batch:
+        yield from flush(batch)
+    if scan_id:
+        store.clear_checkpoint(scan_id)
+    else:
+        store.conn.commit()
+
+
+def _truncate_jsonl(path: str, rows: int) -> None:
+    """Cut a JSONL result file before the first line for row ``rows`` or later
+
+    A crash can leave the last line half written; the file is then cut at
+    the end of the last complete line.
+    """
+    with open(path, "r+b") as f:
+        position = 0
+        for line in iter(f.readline, b""):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                if json.loads(line)["row"] >= rows:
+                    break
+            except (ValueError, KeyError):
+                break
+            position += len(line)
+        f.truncate(position)
+
+
+def main():
+    """Re-scan a newline-delimited message archive incrementally"""
+    parser = argparse.ArgumentParser(description="Incremental corpus scan with a verdict store")
+    parser.add_argument("corpus", help="text file with one message per line")
+    parser.add_argument("--store", default="verdicts.db")
+    parser.add_argument("--scan-id", help="checkpoint name; rerun with the same id to resume")
+    parser.add_argument("--output", help="JSONL file for results (appended on resume)")
+    parser.add_argument("--columnar", help="directory for memory-mappable columnar results")
+    parser.add_argument("--ruleset", help="ruleset JSON to scan with")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--prune", action="store_true",
+                        help="afterwards drop verdicts and stage scores of older rules")
+    args = parser.parse_args()
+
+    from deepfake_detector import ContentDetector
+    detector = ContentDetector(profile="lite")
+    if args.ruleset:
+        from ruleset import load_ruleset, apply_ruleset
+        apply_ruleset(detector, load_ruleset(args.ruleset))
+
+    store = VerdictStore(args.store)
+    stats: Dict[str, int] = {}
+    start = time.perf_counter()
+    output = columnar = None
+    try:
+        with open(args.corpus, "r", encoding="utf-8") as corpus:
+            rows = (line.rstrip("\n") for line in corpus)
+            resume_at = store.get_checkpoint(args.scan_id, detector_version(detector)) if args.scan_id else 0
+            if args.output:
+                # Rows written after the last checkpoint are scored again
+                if resume_at and os.path.exists(args.output):
+                    _truncate_jsonl(args.output, resume_at)
+                output = open(args.output, "a" if resume_at else "w", encoding="utf-8")
+            if args.columnar:
+                from columnar_results import ColumnarWriter
+                columnar = ColumnarWriter(args.columnar, list(detector.patterns.keys()),
+                                          keep_rows=resume_at if resume_at else None)
+
+            def before_checkpoint(position: int) -> None:
+                if output:
+                    output.flush()
+                if columnar:
+                    columnar.flush()
+
+            detected = 0
+            for index, result in incremental_scan(detector, rows, store, args.scan_id,
+                                                  args.batch_size, stats, before_checkpoint):
+                detected += result["is_detected"]
+                if columnar:
+                    columnar.append(index, result)
+                if output:
+                    output.write(json.dumps({
+                        "row": index,
+                        "is_detected": result["is_detected"],
+                        "category": result["category"],
+                        "confidence": result["confidence"]
+                    }) + "\n")
+        if args.prune:
+            stats["pruned"] = store.prune(detector_version(detector), stage_versions(detector))
+    finally:
+        if output:
+            output.close()
+        if columnar:
+            columnar.close()
+        store.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"🗄️  Scanned {stats['rows']} rows in {elapsed:.2f}s "
+          f"(resumed at row {stats['resumed_from']}), {detected} detected")
+    print(f"   {stats['verdict_hits']} cached verdicts, {stats['stage_reuse']} partially re-scored, "
+          f"{stats['scored']} fully scored")
+    if args.prune:
+        print(f"   Pruned {stats['pruned']} rows of older rules")
+
+
+if __name__ == "__main__":
+    main()